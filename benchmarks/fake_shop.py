@@ -0,0 +1,196 @@
+import json
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+SESSION_COOKIE = "bench_session=1"
+TERMS_COOKIE = "bench_terms=1"
+
+# Laid out so every XPath in WebMonitor and page_extractor.DEFAULT_SELECTORS
+# resolves: #__next/div/div/div[1] header, div[2] product, div[3] terms banner
+PRODUCT_PAGE = """<!DOCTYPE html>
+<html><head><title>{name}</title></head>
+<body>
+<div id="__next"><div><div>
+  <div><div><div></div><div><div></div><div>
+    <a href="/login?next={path}"><span><div>Sign in / Register</div></span></a>
+    {signed_in}
+    <div class="index_cartItem__xumFD">Cart</div>
+  </div></div></div></div>
+  <div><div><div></div><div><div></div><div><div>
+    <div><div><div><h1>{name}</h1></div></div><div><div>{price}</div></div></div>
+    <div><div>Size</div><div>{sizes}</div></div>
+    <div><div class="index_quantityContainer__OhYal"><input type="number" value="1"{input_state}></div></div>
+    <div></div>
+    <div><div class="{cart_class}" onclick="fetch('/api/cart/add?product={product_id}', {{method: 'POST'}})">{cart_text}</div><div>{buy_text}</div></div>
+  </div></div></div></div></div>
+  <div>{terms}</div>
+</div></div></div>
+<script id="__NEXT_DATA__" type="application/json">{next_data}</script>
+</body></html>
+"""
+
+TERMS_BANNER = """<div><div>By continuing you accept the terms.</div>
+  <div onclick="document.cookie='{cookie}; path=/'; this.parentNode.remove()">Accept</div></div>"""
+
+# The sign-in and continue buttons share one XPath, as on the real site
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>Sign in</title></head>
+<body>
+<div id="__next"><div><div>
+  <div></div>
+  <div><div><div><form onsubmit="return false">
+    <div><input id="email" type="email"></div>
+    <div><input id="password" type="password"></div>
+    <div><div><div><div><div><button type="button" onclick="
+      if (document.getElementById('password').value) {{
+        document.cookie = '{cookie}; path=/';
+        window.location = '{next}';
+      }}">Continue</button></div></div></div></div></div>
+  </form></div></div></div>
+</div></div></div>
+</body></html>
+"""
+
+
+class ProductState:
+    __slots__ = ('product_id', 'in_stock', 'changed_at', 'first_served_in_stock', 'cart_adds')
+
+    def __init__(self, product_id, in_stock=False):
+        self.product_id = product_id
+        self.in_stock = in_stock
+        self.changed_at = time.monotonic()
+        self.first_served_in_stock = None
+        self.cart_adds = 0
+
+
+class FakeShop:
+    """Local stand-in for the product site with in-stock, sold-out and login pages.
+
+    /product/<id> renders the store's DOM and __NEXT_DATA__ for the current
+    stock state, /login is the sign-in form WebMonitor.login_and_return
+    fills in, and POST /api/cart/add counts cart clicks. Stock flips are
+    timestamped so the runner can measure detection latency.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self.products = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def product_url(self, product_id):
+        return f"{self.base_url}/product/{product_id}"
+
+    def add_product(self, product_id, in_stock=False):
+        with self._lock:
+            self.products[str(product_id)] = ProductState(str(product_id), in_stock)
+        return self.product_url(product_id)
+
+    def set_stock(self, product_id, in_stock):
+        with self._lock:
+            state = self.products[str(product_id)]
+            if state.in_stock != in_stock:
+                state.in_stock = in_stock
+                state.changed_at = time.monotonic()
+                state.first_served_in_stock = None
+
+    def _served(self, state):
+        """Note when an in-stock page was first handed out after a flip"""
+        with self._lock:
+            self.requests += 1
+            if state.in_stock and state.first_served_in_stock is None:
+                state.first_served_in_stock = time.monotonic()
+
+    def render_product(self, state, signed_in, terms_accepted=False):
+        name = f"Benchmark Product {state.product_id}"
+        sizes = ["S", "M", "L"]
+        stock = 5 if state.in_stock else 0
+        next_data = {"props": {"pageProps": {"product": {
+            "title": name,
+            "price": "19.99",
+            "skus": [{"title": size, "stock": {"onlineStock": stock}} for size in sizes],
+        }}}}
+        return PRODUCT_PAGE.format(
+            name=escape(name),
+            path=f"/product/{state.product_id}",
+            product_id=state.product_id,
+            signed_in='<div class="index_title___gOaU">My Orders</div>' if signed_in else '',
+            price="$19.99",
+            sizes="<br>".join(sizes),
+            input_state="" if state.in_stock else " disabled",
+            cart_class="index_addToCart" if state.in_stock else "index_addToCart index_disabled",
+            cart_text="ADD TO CART" if state.in_stock else "SOLD OUT",
+            buy_text="BUY NOW" if state.in_stock else "SOLD OUT",
+            terms='' if terms_accepted else TERMS_BANNER.format(cookie=TERMS_COOKIE),
+            next_data=json.dumps(next_data).replace("</", "<\\/"),
+        )
+
+    def start(self):
+        shop = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, status, body, content_type="text/html; charset=utf-8"):
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path.startswith("/product/"):
+                    state = shop.products.get(url.path.rsplit("/", 1)[-1])
+                    if state is None:
+                        self._reply(404, "Not found")
+                        return
+                    shop._served(state)
+                    cookies = self.headers.get("Cookie") or ""
+                    self._reply(200, shop.render_product(state, SESSION_COOKIE in cookies, TERMS_COOKIE in cookies))
+                elif url.path == "/login":
+                    next_url = parse_qs(url.query).get("next", ["/"])[0]
+                    self._reply(200, LOGIN_PAGE.format(cookie=SESSION_COOKIE, next=escape(next_url)))
+                else:
+                    self._reply(404, "Not found")
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                if url.path != "/api/cart/add":
+                    self._reply(404, "Not found")
+                    return
+                state = shop.products.get(parse_qs(url.query).get("product", [""])[0])
+                if state is None or not state.in_stock:
+                    self._reply(409, json.dumps({"ok": False}), "application/json")
+                    return
+                with shop._lock:
+                    state.cart_adds += 1
+                self._reply(200, json.dumps({"ok": True}), "application/json")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="fake-shop", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
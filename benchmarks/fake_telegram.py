@@ -0,0 +1,121 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class FakeTelegramApi:
+    """Local stand-in for the Telegram Bot API.
+
+    Answers sendMessage the way api.telegram.org does and records when
+    each message arrived; getMe, getUpdates (an empty long poll),
+    deleteWebhook and setMyCommands are enough for telegram_bot to start
+    against it. rate_limit_every=N answers every Nth send with a 429 so
+    the dispatcher's retry path is exercised.
+    """
+
+    UPDATES_POLL_SECONDS = 1.0
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, rate_limit_every=0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.messages = []
+        self.sends = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def api_base(self):
+        return f"http://{self.host}:{self.port}"
+
+    def messages_for(self, text_fragment):
+        with self._lock:
+            return [message for message in self.messages if text_fragment in message['text']]
+
+    def _send_message(self, payload):
+        with self._lock:
+            self.sends += 1
+            if self.rate_limit_every and self.sends % self.rate_limit_every == 0:
+                return 429, {"ok": False, "error_code": 429, "description": "Too Many Requests: retry after 1",
+                             "parameters": {"retry_after": 1}}
+            message_id = len(self.messages) + 1
+            self.messages.append({
+                'message_id': message_id,
+                'chat_id': payload.get('chat_id'),
+                'text': payload.get('text', ''),
+                'received_at': time.monotonic(),
+            })
+        return 200, {"ok": True, "result": {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": payload.get('chat_id'), "type": "private"},
+            "text": payload.get('text', ''),
+        }}
+
+    def handle(self, method, payload):
+        if method == "sendMessage":
+            return self._send_message(payload)
+        if method == "getMe":
+            return 200, {"ok": True, "result": {"id": 1, "is_bot": True, "first_name": "Benchmark",
+                                                "username": "benchmark_bot", "can_join_groups": False,
+                                                "can_read_all_group_messages": False,
+                                                "supports_inline_queries": False}}
+        if method == "getUpdates":
+            time.sleep(min(float(payload.get('timeout') or 0), self.UPDATES_POLL_SECONDS))
+            return 200, {"ok": True, "result": []}
+        if method in ("deleteWebhook", "setMyCommands", "close", "logOut"):
+            return 200, {"ok": True, "result": True}
+        return 404, {"ok": False, "error_code": 404, "description": "Not Found"}
+
+    def start(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self, payload):
+                method = urlparse(self.path).path.rsplit("/", 1)[-1]
+                if api.latency:
+                    time.sleep(api.latency)
+                status, body = api.handle(method, payload)
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                self._dispatch({key: values[0] for key, values in query.items()})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                content_type = self.headers.get("Content-Type") or ""
+                try:
+                    if "json" in content_type:
+                        payload = json.loads(raw or b"{}")
+                    else:
+                        payload = {key: values[0] for key, values in parse_qs(raw.decode("utf-8")).items()}
+                except ValueError:
+                    payload = {}
+                self._dispatch(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="fake-telegram", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,289 @@
+"""Offline throughput and latency benchmark.
+
+Runs N monitoring tasks against a local fake product site and a local
+Telegram Bot API stand-in, so nothing reaches the real store or
+api.telegram.org. Every product starts sold out and flips to in stock
+part-way through; the run reports checks/sec, stock-flip to detection to
+notification latency, memory per monitored URL and phase timings.
+
+    python -m benchmarks.run_benchmark --tasks 50 --duration 30
+    python -m benchmarks.run_benchmark --mode browser --tasks 8 --driver-path /path/to/driver_dir
+
+Run from the repository root. App data (outbox, journals, subscribers) goes
+to a temporary folder through TIKTOK_BOT_DATA_DIR and is removed afterwards.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_shop import FakeShop
+from benchmarks.fake_telegram import FakeTelegramApi
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def latency_summary(values):
+    return {
+        'count': len(values),
+        'p50': percentile(values, 0.5),
+        'p95': percentile(values, 0.95),
+        'max': max(values) if values else None,
+    }
+
+
+def memory_mb(include_children=False):
+    """Resident memory of this process (and its Chrome children), in MB"""
+    try:
+        import psutil
+    except ImportError:
+        import resource
+        # Peak RSS without psutil: kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    process = psutil.Process()
+    total = process.memory_info().rss
+    if include_children:
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                continue
+    return total / (1024 * 1024)
+
+
+def make_http_task_class():
+    from src.core.monitor_task import MonitorTask
+
+    class HttpOnlyTask(MonitorTask):
+        """MonitorTask on the HTTP fast path only; cart clicks become POSTs to the fake shop"""
+
+        def open_session(self):
+            pass
+
+        def close_session(self):
+            pass
+
+        def click_add_to_cart_button(self, refresh=False):
+            product_id = self.url.rstrip('/').rsplit('/', 1)[-1]
+            base_url = self.url.split('/product/', 1)[0]
+            response = self.http_monitor.session.post(f"{base_url}/api/cart/add", params={'product': product_id},
+                                                      timeout=self.http_monitor.timeout)
+            return response.status_code == 200
+
+    return HttpOnlyTask
+
+
+def prepare_app_data(telegram, subscribers):
+    """Point the bot at the fake Telegram API and subscribe the benchmark chats"""
+    from src.core.managers.json_file_handler import get_json_path
+    from src.core.managers.storage import get_storage
+    from src.core.notifications.subscriber_store import get_subscriber_store
+    get_storage().write_json(get_json_path("telegram_config.json"), {
+        'bot_token': "123456:benchmark",
+        'api_base': telegram.api_base,
+        'password': "benchmark",
+    }, indent=4)
+    store = get_subscriber_store()
+    for chat_id in range(1, subscribers + 1):
+        store.add(chat_id, f"bench{chat_id}", "Bench", str(chat_id))
+
+
+def run(args):
+    from src.core.managers.metrics import CHECKS, CART_SUCCESSES, NOTIFICATION_RETRIES
+    from src.core.managers.phase_tracer import get_tracer
+    from src.core.managers.task_scheduler import MonitorScheduler
+    from src.core.managers.persistence_manager import PersistenceManager
+    from src.core.managers.http_monitor import HttpProductMonitor
+    from src.core.notifications.send_notifications import stop_outbox
+    from src.core.notifications.telegram_client import close_client
+
+    shop = FakeShop().start()
+    telegram = FakeTelegramApi(latency=args.telegram_latency, rate_limit_every=args.rate_limit_every).start()
+    prepare_app_data(telegram, args.subscribers)
+
+    driver_pool = None
+    http_monitor = None
+    if args.mode == "browser":
+        from main import ChromeDriverManager
+        from src.core.managers.json_file_handler import JsonFileHandler
+        from src.core.managers.driver_pool import DriverPool
+        from src.core.monitor_task import MonitorTask
+        driver_path = args.driver_path or ChromeDriverManager(JsonFileHandler(), offline=args.offline) \
+            .initialize_driver_path()
+        driver_pool = DriverPool(driver_path, size=args.browsers, tabs_per_session=args.tabs_per_browser,
+                                 headless=True)
+        driver_pool.start()
+        task_class = MonitorTask
+    else:
+        http_monitor = HttpProductMonitor(pool_size=args.workers)
+        task_class = make_http_task_class()
+
+    scheduler = MonitorScheduler(max_workers=args.workers, max_concurrent=args.workers,
+                                 per_domain_limit=args.workers, max_session_opens=args.browsers)
+    scheduler.start()
+    persistence_manager = PersistenceManager()
+    baseline_mb = memory_mb(include_children=args.mode == "browser")
+
+    urls = [shop.add_product(index, in_stock=False) for index in range(args.tasks)]
+    tasks = []
+    for index, url in enumerate(urls):
+        task = task_class(None, persistence_manager, url, check_interval=args.interval,
+                          driver_pool=driver_pool, http_monitor=http_monitor)
+        tasks.append(task)
+        scheduler.add_task(task, start_delay=index * args.interval / args.tasks)
+
+    started = time.monotonic()
+    flip_at = started + args.duration * args.flip_at
+    flipped = False
+    peak_mb = baseline_mb
+    while time.monotonic() - started < args.duration:
+        time.sleep(0.5)
+        peak_mb = max(peak_mb, memory_mb(include_children=args.mode == "browser"))
+        if not flipped and time.monotonic() >= flip_at:
+            for index in range(args.tasks):
+                shop.set_stock(index, True)
+            flipped = True
+    elapsed = time.monotonic() - started
+    checks_ok = CHECKS.value(result="ok")
+    checks_failed = CHECKS.value(result="error")
+
+    # Let alerts already in flight land before measuring latency
+    deadline = time.monotonic() + args.drain_seconds
+    while time.monotonic() < deadline and len(telegram.messages) < args.tasks * args.subscribers:
+        time.sleep(0.2)
+
+    detection, notification, end_to_end = [], [], []
+    for index, url in enumerate(urls):
+        state = shop.products[str(index)]
+        messages = telegram.messages_for(f"({url})")
+        if state.first_served_in_stock is not None:
+            detection.append(state.first_served_in_stock - state.changed_at)
+        if messages and state.first_served_in_stock is not None:
+            notification.append(messages[0]['received_at'] - state.first_served_in_stock)
+            end_to_end.append(max(message['received_at'] for message in messages) - state.changed_at)
+
+    phases = get_tracer().snapshot().get('all', {})
+    results = {
+        'mode': args.mode,
+        'tasks': args.tasks,
+        'interval': args.interval,
+        'subscribers': args.subscribers,
+        'duration': round(elapsed, 2),
+        'checks': checks_ok,
+        'failed_checks': checks_failed,
+        'checks_per_second': checks_ok / elapsed if elapsed else 0,
+        'detection_latency': latency_summary(detection),
+        'detection_to_first_notification': latency_summary(notification),
+        'flip_to_all_notified': latency_summary(end_to_end),
+        'notifications_received': len(telegram.messages),
+        'notification_retries': NOTIFICATION_RETRIES.value(),
+        'cart_successes': CART_SUCCESSES.value(),
+        'memory_baseline_mb': baseline_mb,
+        'memory_peak_mb': peak_mb,
+        'memory_per_url_mb': (peak_mb - baseline_mb) / args.tasks if args.tasks else 0,
+        'phases': phases,
+    }
+
+    for task in tasks:
+        task.stop()
+    scheduler.shutdown()
+    if driver_pool:
+        driver_pool.shutdown()
+    if http_monitor:
+        http_monitor.close()
+    stop_outbox()
+    close_client()
+    telegram.stop()
+    shop.stop()
+    return results
+
+
+def format_seconds(value):
+    return "-" if value is None else f"{value * 1000:.0f}ms"
+
+
+def report(results):
+    lines = [
+        f"Mode: {results['mode']}, {results['tasks']} task(s) every {results['interval']}s, "
+        f"{results['subscribers']} subscriber(s), {results['duration']}s",
+        f"Checks: {results['checks']} ok, {results['failed_checks']} failed, "
+        f"{results['checks_per_second']:.1f} checks/sec",
+    ]
+    for key, title in (('detection_latency', "Flip to detection"),
+                       ('detection_to_first_notification', "Detection to first alert"),
+                       ('flip_to_all_notified', "Flip to all alerts")):
+        summary = results[key]
+        lines.append(f"{title}: n={summary['count']} p50={format_seconds(summary['p50'])} "
+                     f"p95={format_seconds(summary['p95'])} max={format_seconds(summary['max'])}")
+    lines.append(f"Alerts received: {results['notifications_received']} "
+                 f"({results['notification_retries']} retried), cart adds: {results['cart_successes']}")
+    lines.append(f"Memory: baseline {results['memory_baseline_mb']:.1f}MB, peak {results['memory_peak_mb']:.1f}MB, "
+                 f"{results['memory_per_url_mb'] * 1024:.0f}KB per URL")
+    for name, summary in sorted(results['phases'].items()):
+        lines.append(f"  {name}: n={summary['count']} p50={format_seconds(summary['p50'])} "
+                     f"p95={format_seconds(summary['p95'])} p99={format_seconds(summary['p99'])}")
+    print("\n".join(lines))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark against a fake shop and Telegram API")
+    parser.add_argument("--mode", choices=("http", "browser"), default="http",
+                        help="http: HTTP fast path only; browser: pooled headless Chrome")
+    parser.add_argument("--tasks", type=int, default=50, help="number of monitored URLs")
+    parser.add_argument("--interval", type=float, default=1.0, help="check interval per task in seconds")
+    parser.add_argument("--duration", type=float, default=30.0, help="run time in seconds")
+    parser.add_argument("--flip-at", type=float, default=0.5,
+                        help="fraction of the run after which every product comes in stock")
+    parser.add_argument("--subscribers", type=int, default=10, help="Telegram subscribers per alert")
+    parser.add_argument("--workers", type=int, default=8, help="scheduler threads")
+    parser.add_argument("--browsers", type=int, default=4, help="pooled Chrome sessions in browser mode")
+    parser.add_argument("--tabs-per-browser", type=int, default=10, help="tabs per Chrome session in browser mode")
+    parser.add_argument("--driver-path", help="ChromeDriver directory for browser mode")
+    parser.add_argument("--offline", action="store_true", help="never download ChromeDriver")
+    parser.add_argument("--telegram-latency", type=float, default=0.0, help="added Bot API response time in seconds")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="answer every Nth send with a 429")
+    parser.add_argument("--drain-seconds", type=float, default=10.0, help="max wait for in-flight alerts")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--keep-data", action="store_true", help="keep the temporary app data folder")
+    parser.add_argument("--verbose", action="store_true", help="show the bot's own logging")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    # Must be set before src is imported, module-level paths are resolved at import
+    data_dir = tempfile.mkdtemp(prefix="tiktok_bot_bench_")
+    os.environ['TIKTOK_BOT_DATA_DIR'] = data_dir
+    # The notifier prints a line per delivered alert
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with quiet:
+            results = run(args)
+    finally:
+        if not args.keep_data:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
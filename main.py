@@ -1,20 +1,28 @@
+import time
+_PROCESS_START = time.perf_counter()
+
 import sys
 import logging
 import os
-import json
 import traceback
-from PyQt6.QtWidgets import QApplication
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from src.ui.main_window import MainWindow
-from src.ui.components.table_widget import TableWidget
-from webdriver_manager.chrome import ChromeDriverManager as WDManager
-from src.core.product_monitor import ProductMonitorWorker
+import argparse
+import signal
 import threading
-from src.core.notifications import telegram_bot
+from concurrent.futures import Future
+from contextlib import contextmanager
+# Heavy packages (PyQt6, selenium, webdriver_manager, python-telegram-bot, httpx)
+# are imported where they are first used, so startup only pays for what it needs
+from src.core.notifications.telegram_client import close_client
+from src.core.notifications.send_notifications import get_outbox, stop_outbox
+from src.core.managers.config_service import get_telegram_config
 import asyncio
-import nest_asyncio
-from src.core.managers.json_file_handler import JsonFileHandler
+from src.core.managers.json_file_handler import JsonFileHandler, get_app_data_path
+from src.core.managers.phase_tracer import get_tracer
+from src.core.managers.persistence_manager import MonitoringTask
+
+# Metrics endpoint is opt-in, e.g. --metrics-port 9310
+DEFAULT_METRICS_PORT = 0
+PHASE_TIMINGS_FILE = "phase_timings.json"
 
 def setup_logging():
     """Configure and initialize application-wide logging"""
@@ -24,47 +32,105 @@ def setup_logging():
     )
     return logging.getLogger(__name__)
 
+class StartupTimings:
+    """Durations of startup phases and when milestones were reached, from process start"""
+
+    def __init__(self, origin=_PROCESS_START):
+        self.origin = origin
+        self.phases = []
+        self.milestones = []
+        self.logger = logging.getLogger(__name__)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        self.phases.append((name, seconds))
+
+    def milestone(self, name):
+        self.milestones.append((name, time.perf_counter() - self.origin))
+
+    def report(self):
+        phases = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases)
+        milestones = ", ".join(f"{name} at {seconds * 1000:.0f}ms" for name, seconds in self.milestones)
+        self.logger.info(f"Startup phases: {phases} | {milestones}")
+
+def offline_from_env():
+    """TIKTOK_BOT_OFFLINE=1 (or true/yes) forbids ChromeDriver downloads"""
+    return os.getenv("TIKTOK_BOT_OFFLINE", "").strip().lower() in ("1", "true", "yes", "on")
+
 class ChromeDriverManager:
-    def __init__(self, file_handler):
+    def __init__(self, file_handler, offline=False):
         """Initialize ChromeDriver manager with file handling capabilities"""
         self.file_handler = file_handler
+        self.offline = offline
         self.logger = logging.getLogger(__name__)
 
     def save_driver_path(self, driver_path):
         """Save ChromeDriver path using the file handler"""
         try:
             self.logger.info('New Driver is installing')
-            return self.file_handler.write_json(
-                "chromedriver_config.json", 
-                {"driver_path": driver_path}
-            )
+            config = self.load_config()
+            config["driver_path"] = driver_path
+            return self.file_handler.write_json("chromedriver_config.json", config)
         except Exception as e:
             self.logger.error(f"Error saving driver path: {e}")
             raise
 
-    def load_driver_path(self):
-        """Load ChromeDriver path using the file handler"""
+    def load_config(self):
+        """chromedriver_config.json: driver_path, plus optional offline and driver_sha256"""
         try:
-            data = self.file_handler.read_json("chromedriver_config.json")
-            if data:
-                return data.get("driver_path")
+            return self.file_handler.read_json("chromedriver_config.json") or {}
         except Exception as e:
-            self.logger.error(f"Error loading driver path: {e}")
-        return None
+            self.logger.error(f"Error loading driver config: {e}")
+        return {}
+
+    def load_driver_path(self):
+        """Load ChromeDriver path using the file handler"""
+        return self.load_config().get("driver_path")
 
     def initialize_driver_path(self):
-        """Initialize and verify ChromeDriver installation"""
+        """Find a ChromeDriver matching the installed Chrome, downloading only on a cache miss"""
+        from src.core.managers.driver_cache import DriverCache, detect_chrome_version, major_version
         try:
-            # Check for existing driver
-            saved_path = self.load_driver_path()
-            if saved_path and os.path.isfile(os.path.join(saved_path, "chromedriver.exe")):
-                self.logger.info(f"Using existing ChromeDriver at: {saved_path}")
-                return saved_path
+            config = self.load_config()
+            offline = self.offline or bool(config.get("offline")) or offline_from_env()
+            cache = DriverCache()
+
+            chrome_version = detect_chrome_version()
+            major = major_version(chrome_version)
+            if major:
+                cached = cache.lookup(major)
+                if cached:
+                    self.logger.info(f"Using cached ChromeDriver for Chrome {major} at: {cached}")
+                    return cached
+            else:
+                self.logger.warning("Installed Chrome version not found, the driver cache is bypassed")
+
+            # Pre-provisioned driver, the only source in offline mode
+            saved_path = config.get("driver_path")
+            if offline or not major:
+                if saved_path and cache.verify(saved_path, config.get("driver_sha256")):
+                    self.logger.info(f"Using existing ChromeDriver at: {saved_path}")
+                    return saved_path
+                if offline:
+                    raise RuntimeError(
+                        f"Offline mode: no cached ChromeDriver for Chrome {major or 'unknown'} "
+                        f"and no valid driver_path in chromedriver_config.json"
+                    )
 
             # Install new driver if necessary
             self.logger.info("Installing new ChromeDriver...")
+            from webdriver_manager.chrome import ChromeDriverManager as WDManager
             full_path = WDManager().install()
             driver_path = os.path.dirname(full_path)
+            if major:
+                driver_path = cache.store(major, full_path, chrome_version)
             self.save_driver_path(driver_path)
             self.logger.info(f"New ChromeDriver installed at: {driver_path}")
             return driver_path
@@ -76,54 +142,97 @@ class ChromeDriverManager:
 class ApplicationManager:
     """Manages the core application lifecycle and components"""
     
-    def __init__(self):
+    def __init__(self, offline=False, metrics_port=DEFAULT_METRICS_PORT):
         self.logger = setup_logging()
         self.app = None
         self.main_window = None
+        self.bot_thread = None
+        self.metrics_port = metrics_port
+        self.metrics_server = None
+        self.timings = StartupTimings()
+        self.timings.milestone("imports done")
         self.file_handler = JsonFileHandler()
-        self.chrome_manager = ChromeDriverManager(self.file_handler)
+        self.chrome_manager = ChromeDriverManager(self.file_handler, offline=offline)
 
     def initialize_application(self):
         """Initialize core application components"""
+        # Qt is only imported by the GUI entry point, never in headless mode
+        from PyQt6.QtWidgets import QApplication
+        import nest_asyncio
         self.app = QApplication(sys.argv)
         nest_asyncio.apply()
         return self.app
 
     def start_telegram_bot(self):
         """Initialize and start the Telegram bot in a separate thread"""
-        bot_thread = threading.Thread(
-            target=lambda: asyncio.run(telegram_bot.run_bot())
-        )
-        bot_thread.daemon = True
-        bot_thread.start()
+        return start_telegram_bot()
 
     def cleanup(self):
         """Perform application cleanup operations"""
         try:
             if self.main_window:
+                self.main_window.shutting_down = True
                 self.main_window.stop_all_monitoring()
+                self.main_window.runtime.shutdown()
+            stop_metrics(self.metrics_server)
+            stop_outbox()
+            close_client()
+            get_telegram_config().stop()
         except Exception as e:
             self.logger.error(f"Error during cleanup: {e}")
 
+    def resolve_driver_path_async(self):
+        """Resolve ChromeDriver on a background thread; returns a Future of the path"""
+        future = Future()
+
+        def resolve():
+            start = time.perf_counter()
+            try:
+                future.set_result(self.chrome_manager.initialize_driver_path())
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                self.timings.record("chromedriver (background)", time.perf_counter() - start)
+
+        threading.Thread(target=resolve, name="driver-resolve", daemon=True).start()
+        return future
+
+    def on_first_paint(self):
+        self.timings.milestone("first paint")
+        self.timings.report()
+
     def run(self):
         """Main application execution flow"""
         try:
             # Initialize application
-            self.initialize_application()
+            with self.timings.phase("qt"):
+                self.initialize_application()
 
-            # Start Telegram bot
-            self.start_telegram_bot()
+            # Start Telegram bot; its libraries are imported on the bot thread
+            self.bot_thread = self.start_telegram_bot()
+            self.metrics_server = start_metrics_server(self.metrics_port)
 
-            # Initialize ChromeDriver
-            driver_path = self.chrome_manager.initialize_driver_path()
+            # Deliver alerts left in the outbox by a previous run
+            with self.timings.phase("outbox"):
+                get_outbox()
+
+            # ChromeDriver resolves while the window is built; the driver pool waits for it
+            driver_path = self.resolve_driver_path_async()
 
             # Create and show main window
-            table_widget = TableWidget()
-            self.main_window = MainWindow(
-                driver_path=driver_path,
-                table_widget=table_widget
-            )
-            self.main_window.show()
+            with self.timings.phase("main window"):
+                from PyQt6.QtCore import QTimer
+                from src.ui.main_window import MainWindow
+                from src.ui.components.table_widget import TableWidget
+                table_widget = TableWidget()
+                self.main_window = MainWindow(
+                    driver_path=driver_path,
+                    table_widget=table_widget
+                )
+                self.main_window.bot_thread = self.bot_thread
+                self.main_window.show()
+            # Runs on the first event-loop turn, right after the window is painted
+            QTimer.singleShot(0, self.on_first_paint)
 
             # Set up cleanup handler
             self.app.aboutToQuit.connect(self.cleanup)
@@ -136,10 +245,142 @@ class ApplicationManager:
             self.logger.error(traceback.format_exc())
             raise
 
+class HeadlessApplication:
+    """Runs monitoring, persistence and notifications on a server without Qt"""
+
+    def __init__(self, urls=None, interval=30, offline=False, metrics_port=DEFAULT_METRICS_PORT):
+        self.logger = setup_logging()
+        self.urls = urls or []
+        self.interval = interval
+        self.metrics_port = metrics_port
+        self.metrics_server = None
+        self.service = None
+        self.stop_requested = threading.Event()
+        self.file_handler = JsonFileHandler()
+        self.chrome_manager = ChromeDriverManager(self.file_handler, offline=offline)
+
+    def request_stop(self, signum=None, frame=None):
+        self.logger.info("Shutdown requested")
+        self.stop_requested.set()
+
+    def cleanup(self):
+        """Stop monitoring and flush state; tasks stay checkpointed for the next start"""
+        try:
+            if self.service:
+                self.service.stop()
+            stop_metrics(self.metrics_server)
+            stop_outbox()
+            close_client()
+            get_telegram_config().stop()
+        except Exception as e:
+            self.logger.error(f"Error during cleanup: {e}")
+
+    def run(self):
+        from src.core.headless_service import HeadlessService
+        import nest_asyncio
+        nest_asyncio.apply()
+        signal.signal(signal.SIGINT, self.request_stop)
+        signal.signal(signal.SIGTERM, self.request_stop)
+        try:
+            start_telegram_bot()
+            self.metrics_server = start_metrics_server(self.metrics_port)
+            get_outbox()
+            driver_path = self.chrome_manager.initialize_driver_path()
+
+            self.service = HeadlessService(driver_path)
+            self.service.start()
+            watched = {monitor.url for monitor in self.service.tasks.values()}
+            for url in self.urls:
+                if url not in watched:
+                    self.service.start_task(MonitoringTask(url=url, interval=self.interval))
+
+            # Wake up periodically so signals are handled promptly on every platform
+            while not self.stop_requested.wait(1):
+                pass
+            return 0
+        except Exception as e:
+            self.logger.error(f"Critical error in headless mode: {e}")
+            self.logger.error(traceback.format_exc())
+            raise
+        finally:
+            self.cleanup()
+
+def start_telegram_bot():
+    """Run the Telegram bot on its own daemon thread"""
+    def run():
+        from src.core.notifications import telegram_bot
+        asyncio.run(telegram_bot.run_bot())
+
+    bot_thread = threading.Thread(target=run, name="telegram-bot")
+    bot_thread.daemon = True
+    bot_thread.start()
+    return bot_thread
+
+def count_chrome_processes():
+    """Chrome and chromedriver processes under this one; open sessions when psutil is missing"""
+    from src.core.managers.metrics import BROWSER_SESSIONS
+    try:
+        import psutil
+    except ImportError:
+        return BROWSER_SESSIONS.value()
+    count = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            if 'chrome' in child.name().lower():
+                count += 1
+        except psutil.Error:
+            continue
+    return count
+
+def start_metrics_server(port):
+    """Serve Prometheus metrics and phase timings on localhost; off unless a port is given"""
+    if not port:
+        return None
+    from src.core.managers.metrics_server import MetricsServer
+    from src.core.managers.metrics import get_metrics, ACTIVE_MONITORS, CHROME_PROCESSES, SUBSCRIBERS
+    from src.core.notifications.subscriber_store import get_subscriber_store
+    from src.core.monitor_task import MonitorTask
+    # Live values are read at scrape time on the server thread, never from the GUI
+    ACTIVE_MONITORS.set_function(lambda: len(MonitorTask.running_tasks))
+    CHROME_PROCESSES.set_function(count_chrome_processes)
+    SUBSCRIBERS.set_function(lambda: len(get_subscriber_store()))
+
+    server = MetricsServer(port)
+    server.add_route("/metrics", lambda: ("text/plain; version=0.0.4; charset=utf-8", get_metrics().render()))
+    server.add_json_route("/phases", get_tracer().snapshot)
+    return server if server.start() else None
+
+def stop_metrics(server):
+    """Stop the endpoint and leave the final phase timings in the app data folder"""
+    if server:
+        server.stop()
+    get_tracer().dump_json(os.path.join(get_app_data_path(), PHASE_TIMINGS_FILE))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="TikTok Shop product monitor")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without the GUI (no Qt), e.g. on a Linux server")
+    parser.add_argument("--url", action="append", default=[],
+                        help="product URL to monitor in headless mode (repeatable)")
+    parser.add_argument("--interval", type=int, default=30,
+                        help="check interval in seconds for --url tasks")
+    parser.add_argument("--offline", action="store_true",
+                        help="never download ChromeDriver; use the cache or driver_path from chromedriver_config.json "
+                             "(also enabled by TIKTOK_BOT_OFFLINE=1)")
+    parser.add_argument("--metrics-port", type=int, default=DEFAULT_METRICS_PORT,
+                        help="serve /metrics (Prometheus) and /phases on this localhost port")
+    # Qt consumes its own arguments, so unknown ones are passed through
+    args, _ = parser.parse_known_args(argv)
+    return args
+
 def main():
     """Application entry point with error handling"""
     try:
-        app_manager = ApplicationManager()
+        args = parse_args()
+        if args.headless:
+            return HeadlessApplication(urls=args.url, interval=args.interval, offline=args.offline,
+                                       metrics_port=args.metrics_port).run()
+        app_manager = ApplicationManager(offline=args.offline, metrics_port=args.metrics_port)
         return app_manager.run()
     except Exception as e:
         logging.error(f"Fatal application error: {e}")
@@ -0,0 +1,46 @@
+import logging
+import threading
+from src.core.monitor_runtime import MonitorRuntime
+from src.core.managers.persistence_manager import MonitoringTask
+from src.core.managers.status_bus import LoggingStatusSink
+from src.core.monitor_task import MonitorTask
+
+
+class HeadlessService:
+    """Monitoring, persistence and notifications without any Qt import.
+
+    Runs MonitorTasks on the same MonitorRuntime MainWindow uses, reports
+    status through a LoggingStatusSink, and runs until stop() is called.
+    """
+
+    def __init__(self, driver_path, status_sink=None):
+        self.logger = logging.getLogger(__name__)
+        self.status_sink = status_sink or LoggingStatusSink()
+        self.runtime = MonitorRuntime(driver_path, headless=True)
+        self.tasks = {}
+        self._stopped = threading.Event()
+
+    def start(self):
+        self.runtime.start()
+        restored = self.runtime.load_restorable()
+        for index, task in enumerate(restored):
+            self.start_task(task, start_delay=self.runtime.restore_delay(index))
+        self.logger.info(f"Headless service started, restored {len(restored)} task(s)")
+
+    def start_task(self, task: MonitoringTask, start_delay=0):
+        """Start monitoring a new or restored task"""
+        monitor = MonitorTask(status_sink=self.status_sink, **self.runtime.monitor_kwargs(task))
+        self.tasks[monitor.task_id] = monitor
+        self.runtime.schedule(monitor, start_delay=start_delay)
+        self.status_sink.publish(monitor.task_id, 'monitoring_status', "Active")
+        return monitor.task_id
+
+    def stop(self):
+        """Release every session; tasks stay checkpointed for the next start"""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        for monitor in list(self.tasks.values()):
+            monitor.stop()
+        self.runtime.shutdown()
+        self.logger.info("Headless service stopped")
@@ -0,0 +1,106 @@
+import json
+import logging
+import os
+import threading
+from src.core.managers.json_file_handler import get_json_path
+from src.core.managers.storage import get_storage
+
+
+class ConfigService:
+    """Cached view of a JSON config file that reloads itself when the file changes.
+
+    Reads are served from an in-memory snapshot, so callers on hot paths
+    never touch disk. A watcher thread polls the file's mtime and swaps in a
+    freshly parsed snapshot in one assignment; listeners are then called
+    with (old, new) so running components can pick up the change without
+    a restart.
+    """
+
+    def __init__(self, file_path, poll_interval=2.0):
+        self.logger = logging.getLogger(__name__)
+        self.file_path = file_path
+        self.poll_interval = poll_interval
+        self._config = {}
+        self._mtime = None
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.reload()
+
+    def get(self, key, default=None):
+        return self._config.get(key, default)
+
+    def snapshot(self):
+        return dict(self._config)
+
+    def subscribe(self, listener):
+        """Call listener(old, new) after every reload that changed the config"""
+        self._listeners.append(listener)
+
+    def reload(self):
+        """Re-read the file if it changed; returns True when the config changed"""
+        with self._lock:
+            try:
+                mtime = os.stat(self.file_path).st_mtime_ns
+            except FileNotFoundError:
+                return False
+            if mtime == self._mtime:
+                return False
+            try:
+                with open(self.file_path, 'r') as f:
+                    new_config = json.load(f)
+            except ValueError as e:
+                # Half-written file; keep the old snapshot and retry next poll
+                self.logger.warning(f"Ignoring unreadable {os.path.basename(self.file_path)}: {e}")
+                return False
+            except Exception as e:
+                self.logger.error(f"Error reading {self.file_path}: {e}")
+                return False
+
+            self._mtime = mtime
+            old_config, self._config = self._config, new_config
+            if old_config == new_config:
+                return False
+
+        self.logger.info(f"Reloaded {os.path.basename(self.file_path)}")
+        for listener in list(self._listeners):
+            try:
+                listener(old_config, new_config)
+            except Exception as e:
+                self.logger.error(f"Error in config listener: {e}")
+        return True
+
+    def update(self, **values):
+        """Write new values to the file and apply them immediately"""
+        config = self.snapshot()
+        config.update(values)
+        get_storage().write_json(self.file_path, config)
+        self.reload()
+
+    def start(self):
+        """Start watching the file for changes made outside this process"""
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._watch, name="config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.reload()
+
+
+_telegram_config = None
+_telegram_config_lock = threading.Lock()
+
+
+def get_telegram_config():
+    """Shared, hot-reloaded telegram_config.json"""
+    global _telegram_config
+    with _telegram_config_lock:
+        if _telegram_config is None:
+            _telegram_config = ConfigService(get_json_path("telegram_config.json"))
+        return _telegram_config
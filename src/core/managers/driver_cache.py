@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+from src.core.managers.json_file_handler import get_app_data_path
+from src.core.managers.storage import get_storage
+
+DRIVER_BINARY = 'chromedriver.exe' if os.name == 'nt' else 'chromedriver'
+
+# Commands that print the installed Chrome version, per platform
+CHROME_VERSION_COMMANDS = {
+    'linux': [['google-chrome', '--version'], ['google-chrome-stable', '--version'],
+              ['chromium', '--version'], ['chromium-browser', '--version']],
+    'darwin': [['/Applications/Google Chrome.app/Contents/MacOS/Google Chrome', '--version']],
+}
+VERSION_PATTERN = re.compile(r'(\d+)\.\d+\.\d+\.\d+')
+
+logger = logging.getLogger(__name__)
+
+
+def _windows_chrome_version():
+    import winreg
+    for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+        try:
+            with winreg.OpenKey(hive, r"Software\Google\Chrome\BLBeacon") as key:
+                return winreg.QueryValueEx(key, "version")[0]
+        except OSError:
+            continue
+    return None
+
+
+def detect_chrome_version():
+    """Installed Chrome version string (e.g. '124.0.6367.91'), or None when it cannot be found.
+
+    Reads the registry on Windows and asks the browser binary elsewhere, so
+    no network access is needed.
+    """
+    try:
+        if os.name == 'nt':
+            return _windows_chrome_version()
+        platform = 'darwin' if os.uname().sysname == 'Darwin' else 'linux'
+        for command in CHROME_VERSION_COMMANDS[platform]:
+            try:
+                output = subprocess.run(command, capture_output=True, text=True, timeout=5).stdout
+            except (OSError, subprocess.SubprocessError):
+                continue
+            match = VERSION_PATTERN.search(output)
+            if match:
+                return match.group(0)
+    except Exception as e:
+        logger.warning(f"Could not detect Chrome version: {e}")
+    return None
+
+
+def major_version(version):
+    match = VERSION_PATTERN.search(version or "")
+    return match.group(1) if match else None
+
+
+def sha256_of(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DriverCache:
+    """Local ChromeDriver store keyed by Chrome major version.
+
+    Each cached driver is copied to drivers/<major>/ under the app data
+    folder and recorded in a manifest with its SHA-256, which is checked
+    before the binary is handed out again, so a cold start with a matching
+    Chrome needs no network at all.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or os.path.join(get_app_data_path(), 'drivers')
+        self.manifest_path = os.path.join(self.cache_dir, 'manifest.json')
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _manifest(self):
+        try:
+            return get_storage().read_json(self.manifest_path, default={}) or {}
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable driver manifest: {e}")
+            return {}
+
+    def lookup(self, major):
+        """Directory of a verified cached driver for this Chrome major version, or None"""
+        with self._lock:
+            manifest = self._manifest()
+            entry = manifest.get(str(major))
+            if not entry:
+                return None
+            binary = os.path.join(entry['path'], DRIVER_BINARY)
+            if os.path.isfile(binary) and sha256_of(binary) == entry.get('sha256'):
+                return entry['path']
+            logger.warning(f"Cached ChromeDriver for Chrome {major} is missing or corrupted, discarding it")
+            manifest.pop(str(major), None)
+            get_storage().write_json(self.manifest_path, manifest)
+            return None
+
+    def store(self, major, binary_path, version=None):
+        """Copy a downloaded driver into the cache; returns its cached directory"""
+        with self._lock:
+            target_dir = os.path.join(self.cache_dir, str(major))
+            os.makedirs(target_dir, exist_ok=True)
+            target = os.path.join(target_dir, DRIVER_BINARY)
+            temp_path = target + '.tmp'
+            shutil.copy2(binary_path, temp_path)
+            if os.name != 'nt':
+                os.chmod(temp_path, 0o755)
+            os.replace(temp_path, target)
+
+            manifest = self._manifest()
+            manifest[str(major)] = {'path': target_dir, 'sha256': sha256_of(target), 'chrome_version': version}
+            get_storage().write_json(self.manifest_path, manifest)
+            logger.info(f"Cached ChromeDriver for Chrome {major} at {target_dir}")
+            return target_dir
+
+    def verify(self, driver_dir, expected_sha256=None):
+        """True if driver_dir holds a driver binary matching expected_sha256 (when given)"""
+        binary = os.path.join(driver_dir, DRIVER_BINARY)
+        if not os.path.isfile(binary):
+            return False
+        return expected_sha256 is None or sha256_of(binary) == expected_sha256
@@ -0,0 +1,228 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:  # psutil is optional, memory checks are skipped without it
+    psutil = None
+
+
+class DriverPool:
+    """Keeps a fixed number of warm Chrome sessions that tasks lease and return.
+
+    driver_path may be a Future still resolving the ChromeDriver location;
+    the warm-up threads wait for it, so the GUI can start in parallel.
+    max_session_memory_mb applies to each session on its own (chromedriver
+    plus its Chrome children), so the pool as a whole may use up to size
+    times that much.
+    """
+
+    def __init__(self, driver_path, size=4, max_uses=50, max_session_memory_mb=None, lease_timeout=120, tabs_per_session=1,
+                 headless=False):
+        self.logger = logging.getLogger(__name__)
+        self.driver_path = driver_path
+        self.headless = headless
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.max_session_memory_mb = max_session_memory_mb
+        self.lease_timeout = lease_timeout
+        # More than one tab per session switches workers to tab-multiplexed mode
+        self.tabs_per_session = max(1, tabs_per_session)
+
+        # LIFO so the most recently used (hottest) session is handed out first
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._uses = {}
+        self._created = 0
+        self._closed = False
+        # Sessions leased long-term to host many product tabs -> task keys they host
+        self._tab_hosts = {}
+
+        if max_session_memory_mb and psutil is None:
+            self.logger.warning("psutil not installed, per-session memory limit is disabled")
+
+    def resolve_driver_path(self):
+        """The ChromeDriver directory, waiting for it if it is still being resolved"""
+        if isinstance(self.driver_path, Future):
+            self.driver_path = self.driver_path.result()
+        return self.driver_path
+
+    def start(self):
+        """Pre-warm the pool in the background so the GUI is not blocked"""
+        for _ in range(self.size):
+            threading.Thread(target=self._warm_one, daemon=True).start()
+
+    def _warm_one(self):
+        """Create one session and park it in the idle queue"""
+        monitor = self._create_session()
+        if monitor:
+            self._idle.put(monitor)
+
+    def _create_session(self):
+        """Launch a new Chrome session if the pool still has room"""
+        with self._lock:
+            if self._closed or self._created >= self.size:
+                return None
+            self._created += 1
+
+        # selenium is imported on the warm-up thread, off the startup path
+        from src.core.managers.web_monitor import WebMonitor
+        try:
+            driver_path = self.resolve_driver_path()
+        except Exception as e:
+            self.logger.error(f"ChromeDriver is not available: {e}")
+            with self._lock:
+                self._created -= 1
+            return None
+        monitor = WebMonitor(driver_path, headless=self.headless)
+        if monitor.driver is None:
+            with self._lock:
+                self._created -= 1
+            self.logger.error("Failed to launch pooled Chrome session")
+            return None
+
+        with self._lock:
+            self._uses[id(monitor)] = 0
+        self.logger.info(f"Pooled Chrome session ready ({self._created}/{self.size})")
+        return monitor
+
+    def _destroy_session(self, monitor):
+        """Quit a session and free its slot"""
+        with self._lock:
+            self._uses.pop(id(monitor), None)
+            self._created -= 1
+        try:
+            monitor.cleanup()
+        except Exception as e:
+            self.logger.error(f"Error quitting pooled session: {e}")
+
+    def _memory_mb(self, monitor):
+        """Resident memory of the chromedriver process and its Chrome children"""
+        if psutil is None:
+            return 0
+        try:
+            process = psutil.Process(monitor.driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except Exception:
+            return 0
+
+    def _needs_recycle(self, monitor):
+        """Decide whether a returned session should be replaced"""
+        if self._uses.get(id(monitor), 0) >= self.max_uses:
+            self.logger.info("Recycling Chrome session after reaching max uses")
+            return True
+        if not monitor.is_alive():
+            self.logger.warning("Recycling unresponsive Chrome session")
+            return True
+        if self.max_session_memory_mb and self._memory_mb(monitor) > self.max_session_memory_mb:
+            self.logger.info("Recycling Chrome session over its memory limit")
+            return True
+        return False
+
+    def acquire(self, timeout=None):
+        """Lease a healthy session, launching one if the pool is not full yet"""
+        timeout = self.lease_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while not self._closed:
+            try:
+                monitor = self._idle.get_nowait()
+            except queue.Empty:
+                monitor = self._create_session()
+                if monitor is None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("No Chrome session available in pool")
+                    try:
+                        monitor = self._idle.get(timeout=remaining)
+                    except queue.Empty:
+                        raise TimeoutError("No Chrome session available in pool")
+
+            # Health check before handing the session out
+            if monitor.is_alive():
+                with self._lock:
+                    self._uses[id(monitor)] = self._uses.get(id(monitor), 0) + 1
+                return monitor
+            self._destroy_session(monitor)
+
+        raise RuntimeError("Driver pool is shut down")
+
+    def release(self, monitor, discard=False):
+        """Return a leased session, recycling it when worn out or broken"""
+        if monitor is None:
+            return
+        if self._closed or discard or self._needs_recycle(monitor):
+            self._destroy_session(monitor)
+            if not self._closed:
+                # Keep the pool warm by replacing the recycled session
+                threading.Thread(target=self._warm_one, daemon=True).start()
+            return
+        self._idle.put(monitor)
+
+    @property
+    def multiplexed(self):
+        return self.tabs_per_session > 1
+
+    def acquire_tab(self, key, url, timeout=None):
+        """Open a tab for a task in a shared session, leasing a new host when all are full"""
+        with self._lock:
+            # Reserve the slot up front so concurrent tasks do not overfill a host
+            host = next((h for h, keys in self._tab_hosts.items() if len(keys) < self.tabs_per_session), None)
+            if host is not None:
+                self._tab_hosts[host].add(key)
+        if host is None:
+            host = self.acquire(timeout)
+            with self._lock:
+                self._tab_hosts[host] = {key}
+        try:
+            host.open_tab(key, url)
+        except Exception:
+            self.release_tab(host, key)
+            raise
+        return host
+
+    def release_tab(self, host, key):
+        """Close a task's tab and give the host back once it has no tabs left"""
+        host.close_tab(key)
+        with self._lock:
+            keys = self._tab_hosts.get(host)
+            if keys is None:
+                return
+            keys.discard(key)
+            if keys:
+                return
+            del self._tab_hosts[host]
+        self.release(host)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """Context manager that always returns the session to the pool"""
+        monitor = self.acquire(timeout)
+        broken = False
+        try:
+            yield monitor
+        except Exception:
+            broken = not monitor.is_alive()
+            raise
+        finally:
+            self.release(monitor, discard=broken)
+
+    def shutdown(self):
+        """Quit every idle session; leased ones are quit when they come back"""
+        with self._lock:
+            self._closed = True
+            hosts, self._tab_hosts = list(self._tab_hosts), {}
+        for host in hosts:
+            self._destroy_session(host)
+        while True:
+            try:
+                monitor = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._destroy_session(monitor)
+        self.logger.info("Driver pool shut down")
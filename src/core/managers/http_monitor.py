@@ -0,0 +1,122 @@
+import json
+import logging
+import re
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ProductParseError(Exception):
+    """Raised when a product page cannot be read without a browser"""
+
+
+class HttpProductMonitor:
+    """Reads product info from the page's __NEXT_DATA__ JSON over a pooled keep-alive session"""
+
+    NEXT_DATA_PATTERN = re.compile(
+        r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL
+    )
+    USER_AGENT = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    )
+
+    def __init__(self, pool_size=10, timeout=5):
+        self.logger = logging.getLogger(__name__)
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": self.USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        self._cookie_lock = threading.Lock()
+
+    def load_cookies(self, cookies):
+        """Reuse cookies exported from a logged-in WebMonitor session"""
+        with self._cookie_lock:
+            for cookie in cookies:
+                self.session.cookies.set(
+                    cookie['name'],
+                    cookie['value'],
+                    domain=cookie.get('domain'),
+                    path=cookie.get('path', '/')
+                )
+        self.logger.info(f"Loaded {len(cookies)} browser cookies into HTTP session")
+
+    def fetch_product_info(self, url):
+        """Fetch the product page and build the same dict as WebMonitor.fetch_product_info"""
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+
+        match = self.NEXT_DATA_PATTERN.search(response.text)
+        if not match:
+            raise ProductParseError("__NEXT_DATA__ not found in page")
+        try:
+            next_data = json.loads(match.group(1))
+        except ValueError as e:
+            raise ProductParseError(f"Invalid __NEXT_DATA__ JSON: {e}")
+
+        product = self._find_product(next_data.get('props', next_data))
+        if product is None:
+            raise ProductParseError("No product data in __NEXT_DATA__")
+        return self._build_product_info(product)
+
+    def _find_product(self, node, depth=0):
+        """Walk the page props for the first object that looks like a product with SKUs"""
+        if depth > 12:
+            return None
+        if isinstance(node, dict):
+            if isinstance(node.get('skus'), list) and (node.get('title') or node.get('name')):
+                return node
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            return None
+        for child in children:
+            found = self._find_product(child, depth + 1)
+            if found is not None:
+                return found
+        return None
+
+    @staticmethod
+    def _sku_stock(sku):
+        """Online stock of a SKU, accepting the shapes the store has used"""
+        stock = sku.get('stock')
+        if isinstance(stock, dict):
+            stock = stock.get('onlineStock', stock.get('stock'))
+        try:
+            return int(stock or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    @staticmethod
+    def _price_text(product, skus):
+        for source in skus[:1] + [product]:
+            for key in ('discountPrice', 'price', 'salePrice'):
+                if source.get(key) not in (None, ''):
+                    return str(source[key])
+        return "Not Found"
+
+    def _build_product_info(self, product):
+        skus = [sku for sku in product.get('skus', []) if isinstance(sku, dict)]
+        in_stock = any(self._sku_stock(sku) > 0 for sku in skus)
+        sizes = [sku.get('title') or sku.get('skuName') or '' for sku in skus]
+
+        product_info = {
+            'name': product.get('title') or product.get('name') or "Not Found",
+            'price': self._price_text(product, skus),
+            'size_options': "\n".join(size for size in sizes if size) or "Not Found",
+            'cart_input_value': "1" if in_stock else "cart_input Not Found",
+            'cart_button': "ADD TO CART" if in_stock else "SOLD OUT",
+            'buy_button': "BUY NOW" if in_stock else "SOLD OUT",
+            'source': 'http',
+        }
+        return product_info
+
+    def close(self):
+        self.session.close()
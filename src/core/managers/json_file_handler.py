@@ -1,8 +1,8 @@
 import os
 import sys
-import json
 import shutil
 import logging
+from src.core.managers.storage import get_storage
 
 class JsonFileHandler:
     def __init__(self):
@@ -27,8 +27,7 @@ class JsonFileHandler:
 
     def _get_app_data_path(self):
         """Get the AppData directory path and create it if it doesn't exist"""
-        app_folder = os.path.join(os.getenv('APPDATA'), 'TikTok_Bot')
-        os.makedirs(app_folder, exist_ok=True)
+        app_folder = get_app_data_path()
         self.logger.info(f"AppData directory: {app_folder}")
         return app_folder
 
@@ -73,8 +72,7 @@ class JsonFileHandler:
         }
         
         file_path = os.path.join(self.app_data_dir, filename)
-        with open(file_path, 'w') as f:
-            json.dump(default_structures.get(filename, {}), f, indent=4)
+        get_storage().write_json(file_path, default_structures.get(filename, {}))
         self.logger.info(f"Created default file: {filename}")
 
     def get_file_path(self, filename):
@@ -84,17 +82,15 @@ class JsonFileHandler:
     def read_json(self, filename):
         """Read and return JSON file contents"""
         try:
-            with open(self.get_file_path(filename), 'r') as f:
-                return json.load(f)
+            return get_storage().read_json(self.get_file_path(filename))
         except Exception as e:
             self.logger.error(f"Error reading {filename}: {str(e)}")
             return None
 
     def write_json(self, filename, data):
-        """Write data to a JSON file"""
+        """Atomically write data to a JSON file"""
         try:
-            with open(self.get_file_path(filename), 'w') as f:
-                json.dump(data, f, indent=4)
+            get_storage().write_json(self.get_file_path(filename), data)
             return True
         except Exception as e:
             self.logger.error(f"Error writing {filename}: {str(e)}")
@@ -118,6 +114,8 @@ def get_app_data_path():
     """Get the path where we can safely store and update our JSON files"""
     # Use AppData on Windows, which is ideal for app data storage
     app_folder = os.path.join(os.getenv('APPDATA'), 'TikTok_Bot') if os.name == 'nt' else os.path.expanduser('~/.tiktok_bot')
+    # TIKTOK_BOT_DATA_DIR points a run (e.g. the benchmarks) at its own data folder
+    app_folder = os.getenv('TIKTOK_BOT_DATA_DIR') or app_folder
     
     # Create the directory if it doesn't exist
     if not os.path.exists(app_folder):
@@ -0,0 +1,65 @@
+import logging
+import time
+from datetime import datetime
+
+
+class LaunchSchedule:
+    """Polling cadence that ramps up around a product drop.
+
+    Far from launch the task polls at its normal slow interval. Inside
+    ramp_lead seconds the interval shrinks linearly towards burst_interval,
+    stays there from burst_before seconds ahead of launch until burst_after
+    seconds past it, then falls back to the slow interval. All timing uses
+    the monotonic clock so wall-clock adjustments cannot skew the window.
+    """
+
+    def __init__(self, launch_time, base_interval, burst_interval=0.25, ramp_lead=120,
+                 burst_before=10, burst_after=60, prewarm_lead=180):
+        self.logger = logging.getLogger(__name__)
+        if isinstance(launch_time, datetime):
+            launch_time = launch_time.timestamp()
+        self.launch_timestamp = float(launch_time)
+        # Anchor the wall-clock launch to the monotonic clock once
+        self.launch_monotonic = time.monotonic() + (self.launch_timestamp - time.time())
+
+        self.base_interval = float(base_interval)
+        self.burst_interval = min(float(burst_interval), self.base_interval)
+        self.ramp_lead = max(ramp_lead, burst_before)
+        self.burst_before = burst_before
+        self.burst_after = burst_after
+        self.prewarm_lead = prewarm_lead
+
+        self.prewarmed = False
+        self.fired_at = None
+        self.timing_error = None
+
+    def seconds_to_launch(self, now=None):
+        now = time.monotonic() if now is None else now
+        return self.launch_monotonic - now
+
+    def interval_at(self, now=None):
+        """Check interval to use at the given monotonic time"""
+        remaining = self.seconds_to_launch(now)
+        if remaining > self.ramp_lead or remaining < -self.burst_after:
+            return self.base_interval
+        if remaining <= self.burst_before:
+            return self.burst_interval
+        # Linear ramp from the slow interval down to the burst interval
+        progress = (self.ramp_lead - remaining) / (self.ramp_lead - self.burst_before)
+        return self.base_interval - progress * (self.base_interval - self.burst_interval)
+
+    def in_burst(self, now=None):
+        remaining = self.seconds_to_launch(now)
+        return -self.burst_after <= remaining <= self.burst_before
+
+    def prewarm_due(self, now=None):
+        return not self.prewarmed and self.seconds_to_launch(now) <= self.prewarm_lead
+
+    def record_fire(self, now=None):
+        """Record when Add to Cart fired; positive error means after launch"""
+        now = time.monotonic() if now is None else now
+        if self.fired_at is None:
+            self.fired_at = now
+            self.timing_error = now - self.launch_monotonic
+            self.logger.info(f"Add to Cart fired {self.timing_error * 1000:+.0f} ms from launch")
+        return self.timing_error
@@ -0,0 +1,180 @@
+import logging
+import threading
+import time
+from collections import deque
+
+PREFIX = "tiktok_bot_"
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels"""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple((name, labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = tuple((name, labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        if not items and not self.labelnames:
+            items = [((), 0)]
+        return [(self.name + "_total", key, value) for key, value in items]
+
+
+class Gauge:
+    """Value that goes up and down, or is read from a callback at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, function=None):
+        self.name = name
+        self.help_text = help_text
+        self._function = function
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set_function(self, function):
+        """Read the value from function() on every scrape instead"""
+        self._function = function
+
+    def value(self):
+        if self._function is not None:
+            return self._function()
+        with self._lock:
+            return self._value
+
+    def samples(self):
+        return [(self.name, (), self.value())]
+
+
+class RateGauge(Gauge):
+    """Events per second over a sliding window, for readers without PromQL rate()"""
+
+    def __init__(self, name, help_text, window=60.0):
+        super().__init__(name, help_text)
+        self.window = window
+        self._events = deque()
+
+    def mark(self):
+        now = time.monotonic()
+        with self._lock:
+            self._events.append(now)
+            self._trim(now)
+
+    def _trim(self, now):
+        cutoff = now - self.window
+        while self._events and self._events[0] < cutoff:
+            self._events.popleft()
+
+    def value(self):
+        with self._lock:
+            self._trim(time.monotonic())
+            return len(self._events) / self.window
+
+
+class MetricsRegistry:
+    """Named counters and gauges rendered in the Prometheus text format.
+
+    Updates only take a per-metric lock, and scrapes read values (or call
+    gauge callbacks) on the metrics server's thread, so exposing them never
+    involves the GUI thread.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(PREFIX + name, help_text, labelnames))
+
+    def gauge(self, name, help_text, function=None):
+        return self._register(Gauge(PREFIX + name, help_text, function))
+
+    def rate(self, name, help_text, window=60.0):
+        return self._register(RateGauge(PREFIX + name, help_text, window))
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            try:
+                samples = metric.samples()
+            except Exception as e:
+                self.logger.error(f"Error collecting metric {metric.name}: {e}")
+                continue
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics():
+    """Process-wide metrics registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
+
+
+# Metrics of the monitor pipeline; gauges read from live state are bound in main.py
+ACTIVE_MONITORS = get_metrics().gauge("active_monitors", "Monitoring tasks currently running")
+CHROME_PROCESSES = get_metrics().gauge("chrome_processes", "Live Chrome and chromedriver processes")
+BROWSER_SESSIONS = get_metrics().gauge("browser_sessions", "Open Selenium browser sessions")
+CHECKS = get_metrics().counter("checks", "Availability checks completed", ("result",))
+MISSED_TICKS = get_metrics().counter("missed_ticks", "Scheduled checks skipped because the previous one ran late")
+CHECKS_PER_SECOND = get_metrics().rate("checks_per_second", "Availability checks per second over the last minute")
+TRANSITIONS = get_metrics().counter("availability_transitions", "Availability changes seen", ("to",))
+CART_ATTEMPTS = get_metrics().counter("cart_attempts", "Add to Cart clicks attempted")
+CART_SUCCESSES = get_metrics().counter("cart_successes", "Add to Cart clicks that succeeded")
+NOTIFICATIONS = get_metrics().counter("notifications", "Telegram deliveries settled", ("status",))
+NOTIFICATION_RETRIES = get_metrics().counter("notification_retries", "Telegram send attempts that were retried")
+SUBSCRIBERS = get_metrics().gauge("subscribers", "Telegram bot subscribers")
@@ -0,0 +1,72 @@
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MetricsServer:
+    """Small HTTP endpoint on localhost serving read-only diagnostics.
+
+    Each route maps a path to a callable returning (content_type, body);
+    handlers run on the server's own threads and never touch the GUI.
+    """
+
+    def __init__(self, port, host="127.0.0.1"):
+        self.logger = logging.getLogger(__name__)
+        self.host = host
+        self.port = port
+        self.routes = {}
+        self._server = None
+        self._thread = None
+
+    def add_route(self, path, handler):
+        self.routes[path] = handler
+
+    def add_json_route(self, path, producer):
+        """Serve producer()'s result as JSON"""
+        self.add_route(path, lambda: ("application/json", json.dumps(producer(), indent=2)))
+
+    def start(self):
+        """Start serving; returns False when the port cannot be bound"""
+        routes = self.routes
+        logger = self.logger
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                handler = routes.get(self.path.split('?', 1)[0])
+                if handler is None:
+                    self.send_error(404)
+                    return
+                try:
+                    content_type, body = handler()
+                except Exception as e:
+                    logger.error(f"Error serving {self.path}: {e}")
+                    self.send_error(500)
+                    return
+                payload = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            self.logger.warning(f"Metrics endpoint not started on {self.host}:{self.port}: {e}")
+            return False
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Metrics endpoint at http://{self.host}:{self.port}")
+        return True
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,139 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# Field name -> XPath on the product page
+DEFAULT_SELECTORS = {
+    'name': "//*[@id='__next']/div/div/div[2]/div[1]/div[2]/div[2]/div/div[1]/div[1]/div[1]/h1",
+    'price': "//*[@id='__next']/div/div/div[2]/div[1]/div[2]/div[2]/div/div[1]/div[2]/div",
+    'size_options': "//*[@id='__next']/div/div/div[2]/div[1]/div[2]/div[2]/div/div[2]/div[2]",
+    'cart_input': "//*[contains(@class, 'index_quantityContainer__OhYal')]//input[@type='number']",
+    'cart_button': "//*[@id='__next']/div/div/div[2]/div[1]/div[2]/div[2]/div/div[5]/div[1]",
+    'buy_button': "//*[@id='__next']/div/div/div[2]/div[1]/div[2]/div[2]/div/div[5]/div[2]",
+}
+
+# Runs inside the page: polls until the required fields render, then returns every field at once
+EXTRACT_SCRIPT = """
+const selectors = arguments[0];
+const required = arguments[1];
+const timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+
+function byXPath(xpath) {
+    try {
+        return document.evaluate(xpath, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    } catch (e) {
+        return null;
+    }
+}
+
+function collect() {
+    const out = {};
+    for (const [key, xpath] of Object.entries(selectors)) {
+        const el = byXPath(xpath);
+        if (!el) {
+            out[key] = null;
+        } else if (el.tagName === 'INPUT') {
+            out[key] = {text: el.value, enabled: !el.disabled && !el.readOnly};
+        } else {
+            const cls = (el.className && el.className.toString()) || '';
+            out[key] = {
+                text: (el.innerText || '').trim(),
+                enabled: !/disabled/i.test(cls) && el.getAttribute('aria-disabled') !== 'true'
+            };
+        }
+    }
+    return out;
+}
+
+const deadline = Date.now() + timeoutMs;
+(function poll() {
+    const out = collect();
+    const ready = required.every(key => out[key] !== null);
+    if (ready || Date.now() >= deadline) {
+        done(out);
+    } else {
+        setTimeout(poll, 100);
+    }
+})();
+"""
+
+
+@dataclass
+class ExtractionResult:
+    name: Optional[str] = None
+    price: Optional[str] = None
+    size_options: Optional[str] = None
+    cart_input_value: Optional[str] = None
+    cart_input_enabled: bool = False
+    cart_button: Optional[str] = None
+    cart_button_enabled: bool = False
+    buy_button: Optional[str] = None
+    missing: List[str] = field(default_factory=list)
+    # Values for custom selectors that have no dedicated field
+    extra: Dict[str, str] = field(default_factory=dict)
+
+    def to_product_info(self) -> Dict:
+        """Convert to the product_info dict used by the rest of the app"""
+        product_info = {
+            'name': self.name or "Not Found",
+            'price': self.price or "Not Found",
+            'size_options': self.size_options or "Not Found",
+            'cart_input_value': self.cart_input_value if self.cart_input_enabled and self.cart_input_value
+            else "cart_input Not Found",
+            'cart_input_enabled': self.cart_input_enabled,
+            'cart_button': self.cart_button or "Not Found",
+            'cart_button_enabled': self.cart_button_enabled,
+            'buy_button': self.buy_button or "Not Found",
+            'missing_fields': list(self.missing),
+        }
+        product_info.update(self.extra)
+        return product_info
+
+
+class PageExtractor:
+    """Collects every product field in a single execute_async_script round trip"""
+
+    def __init__(self, selectors: Optional[Dict[str, str]] = None, required=('name',), timeout=10):
+        self.logger = logging.getLogger(__name__)
+        self.selectors = dict(DEFAULT_SELECTORS)
+        if selectors:
+            self.selectors.update(selectors)
+        self.required = [key for key in required if key in self.selectors]
+        self.timeout = timeout
+
+    def extract(self, driver, timeout=None) -> ExtractionResult:
+        """Read all configured fields from the current page"""
+        timeout = self.timeout if timeout is None else timeout
+        # The in-page wait must finish before WebDriver gives up on the script. The
+        # setting lives on the driver object, so a recycled session is configured again
+        script_timeout = timeout + 5
+        if getattr(driver, '_extractor_script_timeout', None) != script_timeout:
+            driver.set_script_timeout(script_timeout)
+            driver._extractor_script_timeout = script_timeout
+
+        raw = driver.execute_async_script(
+            EXTRACT_SCRIPT, self.selectors, self.required, int(timeout * 1000)
+        ) or {}
+
+        result = ExtractionResult()
+        for key in self.selectors:
+            value = raw.get(key)
+            if value is None:
+                result.missing.append(key)
+                continue
+            if key == 'cart_input':
+                result.cart_input_value = value.get('text')
+                result.cart_input_enabled = bool(value.get('enabled'))
+            elif key == 'cart_button':
+                result.cart_button = value.get('text')
+                result.cart_button_enabled = bool(value.get('enabled'))
+            elif key in ('name', 'price', 'size_options', 'buy_button'):
+                setattr(result, key, value.get('text'))
+            else:
+                result.extra[key] = value.get('text')
+
+        if result.missing:
+            self.logger.warning(f"Fields not found on page: {', '.join(result.missing)}")
+        return result
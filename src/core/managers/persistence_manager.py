@@ -1,38 +1,156 @@
 import json
 import os
 import logging
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, asdict, field
 from typing import List, Optional
 from datetime import datetime
 from src.core.managers.json_file_handler import get_json_path
+from src.core.managers.storage import get_storage
 
 @dataclass
 class MonitoringTask:
     url: str
     interval: int
+    task_id: Optional[str] = None
+    # Epoch seconds; None when the task has no launch-time precision mode
+    launch_time: Optional[float] = None
+    last_product_info: Optional[dict] = field(default=None)
+    last_availability: Optional[bool] = None
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, item):
+        return cls(
+            url=item['url'],
+            interval=item['interval'],
+            task_id=item.get('task_id'),
+            launch_time=item.get('launch_time'),
+            last_product_info=item.get('last_product_info'),
+            last_availability=item.get('last_availability')
+        )
 
 file_path = get_json_path('Actived_tasks.json')
 class PersistenceManager:
-    def __init__(self, file_path=file_path):
+    """Checkpoints active tasks continuously instead of only on exit.
+
+    Actived_tasks.json is the snapshot. Every add, stop, retune and state
+    change is appended to a journal next to it as it happens, so a crash
+    loses nothing. The journal is folded into the snapshot on load, on
+    compact(), and whenever it grows past compact_threshold entries.
+    """
+
+    def __init__(self, file_path=file_path, journal_path=None, compact_threshold=200):
         self.file_path = file_path
+        self.journal_path = journal_path or file_path + ".journal"
+        self.compact_threshold = compact_threshold
         self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._tasks = {}
+        self._journal_entries = 0
+        self._loaded = False
 
     def load_active_tasks(self) -> List[MonitoringTask]:
-        """Load active monitoring tasks from file"""
-        try:
-            if not os.path.exists(self.file_path):
-                return []
-                
-            with open(self.file_path, 'r') as f:
-                data = json.load(f)
-            
-            tasks = [MonitoringTask(
-                url=item['url'],
-                interval=item['interval']
-            ) for item in data]
-            
-            self.logger.info(f"Loaded {len(tasks)} tasks")
-            return tasks
-        except Exception as e:
-            self.logger.error(f"Error loading tasks: {e}")
-            return []
+        """Load active monitoring tasks from the snapshot plus journal"""
+        with self._lock:
+            self._tasks = {}
+            self._loaded = True
+            try:
+                data = get_storage().read_json(self.file_path, default=[])
+                for index, item in enumerate(data):
+                    task = MonitoringTask.from_dict(item)
+                    # Snapshots written before task ids were stored get a stable placeholder
+                    task.task_id = task.task_id or f"restored-{index}"
+                    self._tasks[task.task_id] = task
+            except Exception as e:
+                self.logger.error(f"Error loading tasks: {e}")
+
+            self._journal_entries = 0
+            try:
+                with open(self.journal_path, 'r') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            # A torn last line from a crash is skipped
+                            continue
+                        self._apply(entry)
+                        self._journal_entries += 1
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self.logger.error(f"Error replaying task journal: {e}")
+
+            if self._journal_entries:
+                self.compact()
+            tasks = list(self._tasks.values())
+
+        self.logger.info(f"Loaded {len(tasks)} tasks")
+        return tasks
+
+    def _apply(self, entry):
+        op = entry.get('op')
+        if op == 'add':
+            task = MonitoringTask.from_dict(entry['task'])
+            self._tasks[task.task_id] = task
+            return
+        task = self._tasks.get(entry.get('task_id'))
+        if task is None:
+            return
+        if op == 'stop':
+            del self._tasks[task.task_id]
+        elif op == 'retune':
+            task.interval = entry['interval']
+        elif op == 'state':
+            task.last_product_info = entry.get('product_info')
+            task.last_availability = entry.get('available')
+
+    def _record(self, entry):
+        with self._lock:
+            if not self._loaded:
+                # Compaction must not drop tasks that were never loaded
+                self.load_active_tasks()
+            self._apply(entry)
+            try:
+                with open(self.journal_path, 'a') as f:
+                    f.write(json.dumps(entry) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._journal_entries += 1
+            except Exception as e:
+                self.logger.error(f"Error writing task journal: {e}")
+                return
+            if self._journal_entries >= self.compact_threshold:
+                self.compact()
+
+    def record_add(self, task: MonitoringTask):
+        """Checkpoint a task that just started"""
+        self._record({'op': 'add', 'task': task.to_dict()})
+
+    def record_stop(self, task_id):
+        """Drop a task the user stopped so it is not restored"""
+        self._record({'op': 'stop', 'task_id': task_id})
+
+    def record_retune(self, task_id, interval):
+        self._record({'op': 'retune', 'task_id': task_id, 'interval': interval})
+
+    def record_state(self, task_id, product_info, available):
+        """Checkpoint the last seen product info so a restore needs no re-scrape"""
+        self._record({'op': 'state', 'task_id': task_id, 'product_info': product_info, 'available': available})
+
+    def compact(self):
+        """Fold the journal into Actived_tasks.json and start a fresh journal"""
+        with self._lock:
+            try:
+                get_storage().write_json(
+                    self.file_path, [task.to_dict() for task in self._tasks.values()], ensure_ascii=False
+                )
+                open(self.journal_path, 'w').close()
+                self._journal_entries = 0
+            except Exception as e:
+                self.logger.error(f"Error compacting task journal: {e}")
@@ -0,0 +1,156 @@
+import bisect
+import functools
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Bucket upper bounds in seconds: 1ms to ~10min, each 25% wider than the last,
+# so any quantile is estimated within one bucket (<25%) at a fixed memory cost
+BUCKET_BOUNDS = tuple(0.001 * 1.25 ** i for i in range(int(math.log(600_000) / math.log(1.25)) + 2))
+QUANTILES = (0.5, 0.95, 0.99)
+ALL_TASKS = "all"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; recording is one bisect and two increments"""
+
+    __slots__ = ('counts', 'count', 'total', 'max', '_lock')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        index = bisect.bisect_left(BUCKET_BOUNDS, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th sample, capped at the observed max"""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = q * self.count
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= rank:
+                    bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+                    return min(bound, self.max)
+            return self.max
+
+    def summary(self):
+        summary = {'count': self.count, 'mean': self.total / self.count if self.count else None, 'max': self.max}
+        for q in QUANTILES:
+            summary[f"p{int(q * 100)}"] = self.quantile(q)
+        return summary
+
+
+class PhaseTracer:
+    """Per-task and overall latency histograms of the monitor pipeline phases.
+
+    phase() times a block with the monotonic clock and records it under the
+    current task (set by the outermost phase given a task_id, per thread)
+    and under ALL_TASKS. Histograms are fixed-size, so the tracer can stay
+    enabled in production.
+    """
+
+    def __init__(self, enabled=True):
+        self.logger = logging.getLogger(__name__)
+        self.enabled = enabled
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _histogram(self, task_id, name):
+        key = (task_id, name)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def current_task(self):
+        return getattr(self._local, 'task_id', None)
+
+    def record(self, name, seconds, task_id=None):
+        if not self.enabled:
+            return
+        task_id = task_id or self.current_task()
+        self._histogram(ALL_TASKS, name).record(seconds)
+        if task_id:
+            self._histogram(task_id, name).record(seconds)
+
+    @contextmanager
+    def phase(self, name, task_id=None):
+        """Time the block as phase name; task_id also applies to phases nested inside it"""
+        if not self.enabled:
+            yield
+            return
+        previous = self.current_task()
+        if task_id:
+            self._local.task_id = task_id
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._local.task_id = previous
+            self.record(name, elapsed, task_id or previous)
+
+    def forget(self, task_id):
+        """Drop a stopped task's histograms"""
+        with self._lock:
+            for key in [key for key in self._histograms if key[0] == task_id]:
+                del self._histograms[key]
+
+    def snapshot(self):
+        """{task_id: {phase: {count, mean, max, p50, p95, p99}}} in seconds"""
+        with self._lock:
+            items = list(self._histograms.items())
+        snapshot = {}
+        for (task_id, name), histogram in items:
+            snapshot.setdefault(task_id, {})[name] = histogram.summary()
+        return snapshot
+
+    def dump_json(self, path):
+        """Write the snapshot to path atomically"""
+        from src.core.managers.storage import get_storage
+        try:
+            get_storage().write_json(path, {'generated_at': time.time(), 'phases': self.snapshot()}, indent=2)
+        except Exception as e:
+            self.logger.error(f"Error writing phase timings to {path}: {e}")
+
+
+def traced(name):
+    """Decorator recording each call of a method as phase name"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer():
+    """Process-wide tracer shared by every monitor"""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = PhaseTracer()
+    return _tracer
@@ -0,0 +1,73 @@
+import logging
+import queue
+import threading
+from abc import ABC, abstractmethod
+
+
+class StatusSink(ABC):
+    """Where a monitor task reports its table values (product_name, monitoring_status, ...)"""
+
+    @abstractmethod
+    def publish(self, task_id, field, value):
+        pass
+
+
+class LoggingStatusSink(StatusSink):
+    """Headless sink: keeps the latest value per field and logs every change"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.state = {}
+        self._lock = threading.Lock()
+
+    def publish(self, task_id, field, value):
+        with self._lock:
+            fields = self.state.setdefault(task_id, {})
+            if fields.get(field) == value:
+                return
+            fields[field] = value
+        self.logger.info(f"[{task_id[:8]}] {field}: {value}")
+
+    def forget(self, task_id):
+        with self._lock:
+            self.state.pop(task_id, None)
+
+
+class StatusBus(StatusSink):
+    """Carries (task_id, field, value) status events from workers to the GUI.
+
+    Workers publish from any thread onto a SimpleQueue, which never blocks
+    the publisher. The GUI thread drains it on a timer and only applies the
+    newest value per (task_id, field), so a burst of updates becomes one
+    repaint per frame and no widget is touched off the GUI thread.
+    """
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+
+    def publish(self, task_id, field, value):
+        self._queue.put((task_id, field, value))
+
+    def drain(self, limit=10000):
+        """Latest value per (task_id, field) among up to limit queued events"""
+        latest = {}
+        for _ in range(limit):
+            try:
+                task_id, field, value = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            latest[(task_id, field)] = value
+        return latest
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_status_bus():
+    """Process-wide bus shared by every monitor and the table"""
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = StatusBus()
+        return _bus
@@ -0,0 +1,101 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+
+class JsonStorage:
+    """Crash-safe JSON writes shared by every component that owns a state file.
+
+    Each write goes to a temp file in the same directory, is fsynced and then
+    swapped in with os.replace, so readers see either the old file or the new
+    one, never a truncated one. Writes to the same path are serialized by a
+    per-file lock.
+    """
+
+    REPLACE_RETRIES = 5
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._file_locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock_for(self, path):
+        path = os.path.abspath(path)
+        with self._locks_lock:
+            lock = self._file_locks.get(path)
+            if lock is None:
+                lock = self._file_locks[path] = threading.Lock()
+            return lock
+
+    def write_json(self, path, data, **dump_kwargs):
+        """Atomically replace path with data serialized as JSON"""
+        dump_kwargs.setdefault('indent', 4)
+        directory = os.path.dirname(os.path.abspath(path))
+        with self._lock_for(path):
+            fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, **dump_kwargs)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._replace(temp_path, path)
+            except BaseException:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                raise
+            self._sync_directory(directory)
+
+    def _replace(self, temp_path, path):
+        # On Windows a reader or virus scanner holding the target makes os.replace fail briefly
+        for attempt in range(self.REPLACE_RETRIES):
+            try:
+                os.replace(temp_path, path)
+                return
+            except PermissionError:
+                if attempt == self.REPLACE_RETRIES - 1:
+                    raise
+                time.sleep(0.05 * (attempt + 1))
+
+    @staticmethod
+    def _sync_directory(directory):
+        """Persist the rename itself; not supported (or needed) on Windows"""
+        if os.name == 'nt':
+            return
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def read_json(self, path, default=None):
+        """Read path, waiting for any write in progress; returns default if missing or empty"""
+        with self._lock_for(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    content = f.read().strip()
+            except FileNotFoundError:
+                return default
+        return json.loads(content) if content else default
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    """Process-wide storage so every writer of a file shares its lock"""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            _storage = JsonStorage()
+        return _storage
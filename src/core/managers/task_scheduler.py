@@ -0,0 +1,317 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from src.core.managers.metrics import MISSED_TICKS
+
+
+class _ScheduledTask:
+    """Scheduler bookkeeping for one monitoring task"""
+
+    def __init__(self, task, interval, start_delay=0, on_ready=None):
+        self.task = task
+        self.interval = interval
+        self.domain = urlparse(task.url).netloc or "default"
+        self.next_due = time.monotonic() + start_delay
+        self.on_ready = on_ready
+        self.generation = 0
+        self.prepared = False
+        self.running = False
+        self.removed = False
+        self.checks = 0
+        self.failures = 0
+        self.open_failures = 0
+        self.missed_ticks = 0
+
+
+class MonitorScheduler:
+    """Runs every monitoring task on one asyncio loop and a fixed pool of threads.
+
+    Tasks sit in a priority queue keyed on their next due time. When a task
+    is due its blocking browser/HTTP work is handed to a bounded thread pool,
+    subject to a global concurrency cap and a per-domain cap. Tasks can be
+    added, removed and retuned from any thread while the scheduler runs.
+
+    A task is any object with task_id, url, check_interval, open_session(),
+    check_once(reload) and close_session(); on_task_error(error) is called
+    when it keeps failing, and current_interval() when present overrides
+    the interval after every check. Opening sessions (browser launch and
+    login) is capped only by max_session_opens, so a burst of new tasks
+    does not launch every browser at once and slow opens never hold the
+    check slots of tasks that are already running. A failed open is retried
+    with exponential backoff; a busy driver pool (TimeoutError) is retried
+    indefinitely, other errors up to MAX_CONSECUTIVE_FAILURES times.
+    """
+
+    MAX_CONSECUTIVE_FAILURES = 5
+    OPEN_RETRY_BACKOFF = 2
+    MAX_OPEN_RETRY_BACKOFF = 60
+
+    def __init__(self, max_workers=8, max_concurrent=8, per_domain_limit=4, max_session_opens=4):
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers
+        self.max_concurrent = max_concurrent
+        self.per_domain_limit = per_domain_limit
+        self.max_session_opens = max_session_opens
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="monitor")
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._heap = []
+        self._counter = itertools.count()
+        self._tasks = {}
+        self._in_flight = set()
+        self._domain_limits = {}
+        self._global_limit = None
+        self._open_limit = None
+        self._wakeup = None
+        self._closed = False
+
+    # ---- lifecycle -------------------------------------------------------
+
+    def start(self):
+        """Start the scheduler loop in its own daemon thread"""
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._run_loop, name="monitor-scheduler", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._global_limit = asyncio.Semaphore(self.max_concurrent)
+        self._open_limit = asyncio.Semaphore(self.max_session_opens)
+        self._wakeup = asyncio.Event()
+        self._loop.create_task(self._dispatch())
+        self._ready.set()
+        self._loop.run_forever()
+
+    def shutdown(self, timeout=30):
+        """Remove every task, release their sessions and stop the loop"""
+        if not self._loop or self._closed:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+        try:
+            future.result(timeout)
+        except Exception as e:
+            self.logger.error(f"Error shutting down scheduler: {e}")
+        self._executor.shutdown(wait=False)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self.logger.info("Monitor scheduler shut down")
+
+    async def _shutdown(self):
+        closing = [self._remove(task_id) for task_id in list(self._tasks)]
+        self._closed = True
+        self._wakeup.set()
+        # Running checks close their own sessions once they finish
+        await asyncio.gather(*self._in_flight, return_exceptions=True)
+        await asyncio.gather(*[f for f in closing if f is not None], return_exceptions=True)
+
+    # ---- public API (thread-safe) ---------------------------------------
+
+    def add_task(self, task, interval=None, start_delay=0, on_ready=None):
+        """Schedule a task; its first check runs start_delay seconds from now, once a slot is free.
+
+        on_ready(task_id, error) is called from the scheduler thread after the
+        task's session was opened, with error None on success.
+        """
+        interval = interval or task.check_interval
+        task.scheduler = self
+        self._loop.call_soon_threadsafe(self._add, task, interval, start_delay, on_ready)
+        return task.task_id
+
+    def remove_task(self, task_id):
+        """Stop scheduling a task and release its browser session"""
+        self._loop.call_soon_threadsafe(self._remove, task_id)
+
+    def retune_task(self, task_id, interval):
+        """Change a task's check interval without restarting it"""
+        self._loop.call_soon_threadsafe(self._retune, task_id, interval)
+
+    def task_count(self):
+        return len(self._tasks)
+
+    # ---- loop-thread internals -------------------------------------------
+
+    def _push(self, entry):
+        entry.generation += 1
+        heapq.heappush(self._heap, (entry.next_due, next(self._counter), entry.task.task_id, entry.generation))
+        self._wakeup.set()
+
+    def _add(self, task, interval, start_delay=0, on_ready=None):
+        if task.task_id in self._tasks:
+            return
+        entry = _ScheduledTask(task, interval, start_delay, on_ready)
+        self._tasks[task.task_id] = entry
+        self._push(entry)
+        self.logger.info(f"Scheduled task {task.task_id} every {interval}s ({len(self._tasks)} tasks)")
+
+    def _remove(self, task_id):
+        entry = self._tasks.pop(task_id, None)
+        if not entry:
+            return
+        entry.removed = True
+        self.logger.info(f"Removed task {task_id} ({len(self._tasks)} tasks)")
+        if not entry.running:
+            self._settle_ready(entry, RuntimeError("Task removed before its session opened"))
+        # A running check closes the session itself when it finishes
+        if not entry.running and entry.prepared:
+            return self._close(entry)
+        return None
+
+    def _close(self, entry):
+        try:
+            return self._loop.run_in_executor(self._executor, entry.task.close_session)
+        except RuntimeError:
+            # Executor already shut down, close inline
+            entry.task.close_session()
+            return None
+
+    def _retune(self, task_id, interval):
+        entry = self._tasks.get(task_id)
+        if not entry:
+            return
+        entry.task.check_interval = interval
+        if entry.running:
+            # Picked up when the running check reschedules itself
+            entry.interval = interval
+            return
+        last_due = entry.next_due - entry.interval
+        entry.interval = interval
+        entry.next_due = max(time.monotonic(), last_due + interval)
+        self._push(entry)
+
+    def _domain_limit(self, domain):
+        if domain not in self._domain_limits:
+            self._domain_limits[domain] = asyncio.Semaphore(self.per_domain_limit)
+        return self._domain_limits[domain]
+
+    async def _dispatch(self):
+        while not self._closed:
+            if not self._heap:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            due, _, task_id, generation = self._heap[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            heapq.heappop(self._heap)
+            entry = self._tasks.get(task_id)
+            # Stale heap entries (removed or rescheduled tasks) are skipped lazily
+            if entry is None or entry.generation != generation or entry.running:
+                continue
+            entry.running = True
+            job = self._loop.create_task(self._execute(entry))
+            self._in_flight.add(job)
+            job.add_done_callback(self._in_flight.discard)
+
+    async def _execute(self, entry):
+        task = entry.task
+        try:
+            if entry.removed:
+                return
+            if not entry.prepared and not await self._open_session(entry):
+                return
+            # Check slots are only held for the check itself, never while a session opens
+            async with self._domain_limit(entry.domain):
+                async with self._global_limit:
+                    if entry.removed:
+                        return
+                    await self._loop.run_in_executor(self._executor, task.check_once, entry.checks > 0)
+            entry.checks += 1
+            entry.failures = 0
+        except Exception as e:
+            entry.failures += 1
+            self.logger.error(
+                f"Check failed for {task.task_id} ({entry.failures}/{self.MAX_CONSECUTIVE_FAILURES}): {e}"
+            )
+            if entry.failures >= self.MAX_CONSECUTIVE_FAILURES:
+                self._remove(task.task_id)
+                if hasattr(task, "on_task_error"):
+                    self._loop.run_in_executor(self._executor, task.on_task_error, e)
+        finally:
+            entry.running = False
+            if entry.removed:
+                self._settle_ready(entry, RuntimeError("Task removed before its session opened"))
+                if entry.prepared:
+                    closing = self._close(entry)
+                    if closing is not None:
+                        await asyncio.gather(closing, return_exceptions=True)
+            elif not entry.prepared:
+                self._retry_open(entry)
+            else:
+                self._reschedule(entry)
+
+    async def _open_session(self, entry):
+        """Open the task's session under the session-open cap; returns True on success"""
+        try:
+            async with self._open_limit:
+                if entry.removed:
+                    return False
+                await self._loop.run_in_executor(self._executor, entry.task.open_session)
+        except Exception as e:
+            entry.open_failures += 1
+            # Release whatever the failed open leased before trying again
+            await asyncio.gather(self._loop.run_in_executor(self._executor, entry.task.close_session),
+                                 return_exceptions=True)
+            if isinstance(e, TimeoutError) or entry.open_failures < self.MAX_CONSECUTIVE_FAILURES:
+                self.logger.warning(f"Opening session for {entry.task.task_id} failed "
+                                    f"(attempt {entry.open_failures}), retrying: {e}")
+                return False
+            self.logger.error(f"Giving up opening session for {entry.task.task_id}: {e}")
+            self._settle_ready(entry, e)
+            self._remove(entry.task.task_id)
+            if hasattr(entry.task, "on_task_error"):
+                self._loop.run_in_executor(self._executor, entry.task.on_task_error, e)
+            return False
+        entry.prepared = True
+        entry.open_failures = 0
+        self._settle_ready(entry, None)
+        return True
+
+    def _retry_open(self, entry):
+        """Requeue a task whose session could not be opened yet"""
+        delay = min(self.OPEN_RETRY_BACKOFF * 2 ** (max(entry.open_failures, 1) - 1), self.MAX_OPEN_RETRY_BACKOFF)
+        entry.next_due = time.monotonic() + delay
+        self._push(entry)
+
+    def _settle_ready(self, entry, error):
+        """Call the task's on_ready callback once"""
+        if not entry.on_ready:
+            return
+        on_ready, entry.on_ready = entry.on_ready, None
+        try:
+            on_ready(entry.task.task_id, error)
+        except Exception as e:
+            self.logger.error(f"Error in ready callback for {entry.task.task_id}: {e}")
+
+    def _reschedule(self, entry):
+        """Fixed-rate: next due is one interval after the previous due time"""
+        if hasattr(entry.task, "current_interval"):
+            # Launch-aware tasks change their cadence over time
+            entry.interval = entry.task.current_interval()
+        now = time.monotonic()
+        entry.next_due += entry.interval
+        if entry.next_due < now:
+            missed = int((now - entry.next_due) // entry.interval)
+            if missed:
+                entry.missed_ticks += missed
+                MISSED_TICKS.inc(missed)
+                self.logger.warning(f"Check of {entry.task.task_id} ran past {entry.interval}s, "
+                                    f"{missed} tick(s) skipped ({entry.missed_ticks} in total)")
+            entry.next_due += missed * entry.interval
+        self._push(entry)
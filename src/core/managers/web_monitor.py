@@ -5,33 +5,49 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import NoSuchWindowException, WebDriverException
+from contextlib import contextmanager
+from src.core.managers.page_extractor import PageExtractor
+from src.core.managers.driver_cache import DRIVER_BINARY
+from src.core.managers.phase_tracer import traced
+from src.core.managers.metrics import BROWSER_SESSIONS
 import logging
 import os
+import threading
 
 class WebMonitor:
-    def __init__(self, driver_path):
+    def __init__(self, driver_path, selectors=None, headless=False):
         self.logger = logging.getLogger(__name__)
         logging.basicConfig(level=logging.INFO)
         self.driver_path = driver_path
+        self.headless = headless
         self.driver = None
         self.url = None
+        self.logged_in = False
+        self.extractor = PageExtractor(selectors)
+        # Tab-multiplexed mode: task key -> {'handle': window handle, 'url': product url}
+        self.tabs = {}
+        self.tab_lock = threading.RLock()
         self.initialize_driver()
 
+    @traced('initialize_driver')
     def initialize_driver(self):
         """Initialize a new WebDriver instance"""
         try:
             # Import subprocess at the top of your file or here
             import subprocess
             
-            chromedriver_path = os.path.join(self.driver_path, 'chromedriver.exe')
+            chromedriver_path = os.path.join(self.driver_path, DRIVER_BINARY)
             chrome_service = Service(chromedriver_path)
             
-            # Add this line to hide the console window
-            chrome_service.creation_flags = subprocess.CREATE_NO_WINDOW
+            # Hide the console window (Windows only)
+            if os.name == 'nt':
+                chrome_service.creation_flags = subprocess.CREATE_NO_WINDOW
             
             options = webdriver.ChromeOptions()
             options.add_argument("--disable-extensions")
-            # options.add_argument("--headless")
+            if self.headless:
+                options.add_argument("--headless=new")
             options.add_argument("--enable-unsafe-swiftshader")
             options.add_argument("--disable-gpu")
             options.add_argument("--no-sandbox")
@@ -50,6 +66,7 @@ class WebMonitor:
             })
             
             self.driver = webdriver.Chrome(service=chrome_service, options=options)
+            BROWSER_SESSIONS.inc()
             self.driver.set_window_size(1920, 1080)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
@@ -58,6 +75,7 @@ class WebMonitor:
         except Exception as e:
             self.logger.error(f"Failed to initialize driver: {e}")
             return False
+    @traced('click_accept_terms')
     def click_accept_terms(self):
         """Click the 'Accept Terms and Conditions' button if present."""
         try:
@@ -126,6 +144,7 @@ class WebMonitor:
         # If none of the success indicators are found
         print("Sign-in failed: Indicators not found.")
         return False
+    @traced('login_and_return')
     def login_and_return(self, url, email, password):
         try:
             # Click the "Sign/Register" button
@@ -164,6 +183,7 @@ class WebMonitor:
 
             # Check sign-in status
             if self.check_sign_in_status():
+                self.logged_in = True
                 print("Sign-in successful. Navigating to the product page...")
             else:
                 print("Sign-in failed. Please check credentials or page behavior.")
@@ -190,6 +210,7 @@ class WebMonitor:
             print(f"An error occurred during login: {e}")
 
 
+    @traced('open_url')
     def open_url(self, url):
         """Opens the specified URL in the browser."""
         try:
@@ -200,7 +221,9 @@ class WebMonitor:
             self.driver.get(url)
             self.click_accept_terms()
             self.wait_for_page_load()
-            self.login_and_return(url,self.email, self.password)
+            # Pooled sessions keep their login between leases
+            if not self.logged_in:
+                self.login_and_return(url,self.email, self.password)
         except Exception as e:
             self.logger.error(f"Error opening URL: {e}")
             raise
@@ -313,6 +336,7 @@ class WebMonitor:
             self.logger.error(f"Error updating cart input value: {e}")
             return False
 
+    @traced('click_add_to_cart_button')
     def click_add_to_cart_button(self):
         """Click the 'Add to Cart' button."""
         try:
@@ -345,36 +369,12 @@ class WebMonitor:
         except Exception as e:
             print(f"An error occurred while trying to click the cart icon: {e}")
 
+    @traced('fetch_product_info')
     def fetch_product_info(self):
-        """Fetches product information from the page."""
+        """Fetches product information from the page in one script round trip."""
         try:
-            product_info = {}
-
-            # Product Name
-            name_element = self.find_element_safe(By.XPATH, "//*[@id='__next']/div/div/div[2]/div[1]/div[2]/div[2]/div/div[1]/div[1]/div[1]/h1")
-            product_info['name'] = name_element.text if name_element else "Not Found"
-
-            # Product Price
-            price_element = self.find_element_safe(By.XPATH, "//*[@id='__next']/div/div/div[2]/div[1]/div[2]/div[2]/div/div[1]/div[2]/div")
-            product_info['price'] = price_element.text if price_element else "Not Found"
-            
-            # Size Div
-            size_div_element = self.find_element_safe(By.XPATH, "//*[@id='__next']/div/div/div[2]/div[1]/div[2]/div[2]/div/div[2]/div[2]")
-            product_info['size_options'] = size_div_element.text if size_div_element else "Not Found"
-            self.locate_quantity_div()
-            # Add to Cart Input
-            cart_input_element = self.fetch_dynamic_input_value()
-            product_info['cart_input_value'] = cart_input_element if cart_input_element else "cart_input Not Found"
-
-            # Add to Cart Button
-            cart_button_element = self.find_element_safe(By.XPATH, "//*[@id='__next']/div/div/div[2]/div[1]/div[2]/div[2]/div/div[5]/div[1]")
-            product_info['cart_button'] = cart_button_element.text if cart_button_element else "Not Found"
-
-            # Buy Now Button
-            buy_button_element = self.find_element_safe(By.XPATH, "//*[@id='__next']/div/div/div[2]/div[1]/div[2]/div[2]/div/div[5]/div[2]")
-            product_info['buy_button'] = buy_button_element.text if buy_button_element else "Not Found"
-
-            
+            result = self.extractor.extract(self.driver)
+            product_info = result.to_product_info()
 
             # Log Product Information
             self.logger.info("Fetched Product Info:")
@@ -387,11 +387,107 @@ class WebMonitor:
             self.logger.error(f"Error fetching product information: {e}")
             raise
 
+    def open_tab(self, key, url):
+        """Open a product URL in its own tab, keyed by the owning task."""
+        with self.tab_lock:
+            if not self.tabs and not self.logged_in:
+                # First tab reuses the start window and performs the login
+                self.open_url(url)
+            else:
+                self.driver.switch_to.new_window('tab')
+                self.driver.get(url)
+                self.wait_for_page_load()
+            self.tabs[key] = {'handle': self.driver.current_window_handle, 'url': url}
+            self.logger.info(f"Opened tab for {key} ({len(self.tabs)} tabs in this browser)")
+            return self.tabs[key]['handle']
+
+    def close_tab(self, key):
+        """Close the tab owned by a task, keeping the browser alive."""
+        with self.tab_lock:
+            tab = self.tabs.pop(key, None)
+            if not tab:
+                return
+            try:
+                if tab['handle'] in self.driver.window_handles:
+                    # Never close the last window, that would end the session
+                    if len(self.driver.window_handles) > 1:
+                        self.driver.switch_to.window(tab['handle'])
+                        self.driver.close()
+                    else:
+                        self.driver.get("about:blank")
+                remaining = self.driver.window_handles
+                if remaining:
+                    self.driver.switch_to.window(remaining[0])
+            except WebDriverException as e:
+                self.logger.warning(f"Error closing tab for {key}: {e}")
+
+    def _reopen_tab(self, key):
+        """Replace a tab that was closed or crashed."""
+        tab = self.tabs[key]
+        self.logger.warning(f"Tab for {key} is gone, reopening {tab['url']}")
+        try:
+            if tab['handle'] in self.driver.window_handles:
+                self.driver.switch_to.window(tab['handle'])
+                self.driver.close()
+        except WebDriverException:
+            pass
+        self.driver.switch_to.new_window('tab')
+        self.driver.get(tab['url'])
+        self.wait_for_page_load()
+        tab['handle'] = self.driver.current_window_handle
+
+    @contextmanager
+    def use_tab(self, key):
+        """Hold the driver and focus the task's tab for the duration of the block."""
+        with self.tab_lock:
+            if key not in self.tabs:
+                raise KeyError(f"No tab open for {key}")
+            try:
+                self.driver.switch_to.window(self.tabs[key]['handle'])
+                # A crashed renderer raises on the first command after switching
+                self.driver.execute_script("return 1")
+            except (NoSuchWindowException, WebDriverException):
+                self._reopen_tab(key)
+            yield self
+
+    def fetch_tab_info(self, key, reload=True):
+        """Fetch product info from one task's tab."""
+        with self.use_tab(key):
+            if reload:
+                self.driver.refresh()
+                self.wait_for_page_load()
+            return self.fetch_product_info()
+
+    def check_all_tabs(self, reload=True):
+        """Cycle through every tab and return product info per task key."""
+        results = {}
+        for key in list(self.tabs):
+            try:
+                results[key] = self.fetch_tab_info(key, reload=reload)
+            except Exception as e:
+                self.logger.error(f"Error checking tab for {key}: {e}")
+                results[key] = None
+        return results
+
+    def export_cookies(self):
+        """Return the session cookies so the HTTP fast path can reuse the login."""
+        with self.tab_lock:
+            return self.driver.get_cookies()
+
+    def is_alive(self):
+        """Check that the browser session still answers commands."""
+        try:
+            return self.driver is not None and self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
     def cleanup(self):
         """Closes the browser and cleans up resources."""
         try:
             if self.driver:
                 self.driver.quit()
+                self.driver = None
+                BROWSER_SESSIONS.dec()
                 self.logger.info("Browser closed successfully")
         except Exception as e:
             self.logger.error(f"Error during cleanup: {e}")
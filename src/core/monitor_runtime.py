@@ -0,0 +1,98 @@
+import logging
+from src.core.managers.driver_pool import DriverPool
+from src.core.managers.http_monitor import HttpProductMonitor
+from src.core.managers.task_scheduler import MonitorScheduler
+from src.core.managers.persistence_manager import PersistenceManager, MonitoringTask
+from src.core.managers.phase_tracer import get_tracer
+
+
+class MonitorRuntime:
+    """Shared components every monitoring task runs on, for the GUI and headless modes.
+
+    Owns the tuning constants, the warm driver pool, the HTTP fast path,
+    the scheduler and the task journal, so MainWindow and HeadlessService
+    only differ in how they display status.
+    """
+
+    # Warm Chrome sessions shared by all monitoring tasks
+    DRIVER_POOL_SIZE = 4
+    DRIVER_MAX_USES = 50
+    # Per session, so the pool may use up to DRIVER_POOL_SIZE times this
+    DRIVER_MAX_SESSION_MEMORY_MB = 600
+    # Product tabs per Chrome session; 1 gives every task its own browser
+    TABS_PER_BROWSER = 10
+    # Threads running checks for all tasks, and how many may hit one shop at once
+    SCHEDULER_WORKERS = 8
+    PER_DOMAIN_LIMIT = 4
+    # Restore: browsers launched at once, seconds between first checks, tasks created per GUI tick
+    SESSION_OPENS = 4
+    RESTORE_STAGGER = 0.25
+    RESTORE_BATCH = 10
+
+    def __init__(self, driver_path, headless=False):
+        self.logger = logging.getLogger(__name__)
+        self.driver_path = driver_path
+        self.persistence_manager = PersistenceManager()
+        self.driver_pool = DriverPool(
+            driver_path,
+            size=self.DRIVER_POOL_SIZE,
+            max_uses=self.DRIVER_MAX_USES,
+            max_session_memory_mb=self.DRIVER_MAX_SESSION_MEMORY_MB,
+            tabs_per_session=self.TABS_PER_BROWSER,
+            headless=headless
+        )
+        # Shared keep-alive session for browserless stock checks
+        self.http_monitor = HttpProductMonitor()
+        self.scheduler = MonitorScheduler(
+            max_workers=self.SCHEDULER_WORKERS,
+            max_concurrent=self.SCHEDULER_WORKERS,
+            per_domain_limit=self.PER_DOMAIN_LIMIT,
+            max_session_opens=self.SESSION_OPENS
+        )
+        self._started = False
+
+    def start(self):
+        self.driver_pool.start()
+        self.scheduler.start()
+        self._started = True
+
+    def monitor_kwargs(self, task: MonitoringTask):
+        """Constructor arguments of a MonitorTask (or ProductMonitorWorker) for task"""
+        return dict(
+            driver_path=self.driver_path,
+            persistence_manager=self.persistence_manager,
+            url=task.url,
+            check_interval=task.interval,
+            driver_pool=self.driver_pool,
+            http_monitor=self.http_monitor,
+            launch_time=task.launch_time,
+            task_id=task.task_id,
+            last_product_info=task.last_product_info,
+            last_availability=task.last_availability
+        )
+
+    def load_restorable(self):
+        """Tasks checkpointed by the previous run"""
+        return self.persistence_manager.load_active_tasks()
+
+    def restore_delay(self, index):
+        """Seconds before the first check of the index-th restored task"""
+        return index * self.RESTORE_STAGGER
+
+    def schedule(self, monitor_task, start_delay=0, on_ready=None):
+        return self.scheduler.add_task(monitor_task, start_delay=start_delay, on_ready=on_ready)
+
+    def forget_task(self, task_id):
+        """Drop a task the user stopped from the journal and the phase timings"""
+        self.persistence_manager.record_stop(task_id)
+        get_tracer().forget(task_id)
+
+    def shutdown(self):
+        """Checkpoint the journal and release every session; tasks stay restorable"""
+        if not self._started:
+            return
+        self._started = False
+        self.persistence_manager.compact()
+        self.scheduler.shutdown()
+        self.driver_pool.shutdown()
+        self.http_monitor.close()
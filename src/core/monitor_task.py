@@ -0,0 +1,324 @@
+import logging
+import time
+from datetime import datetime
+from src.core.managers.persistence_manager import MonitoringTask
+from src.core.managers.launch_schedule import LaunchSchedule
+from src.core.managers.status_bus import LoggingStatusSink
+from src.core.managers.phase_tracer import get_tracer
+from src.core.managers.metrics import CHECKS, CHECKS_PER_SECOND, TRANSITIONS, CART_ATTEMPTS, CART_SUCCESSES
+from src.core.managers.http_monitor import ProductParseError
+import requests
+from src.core.notifications.send_notifications import send_notifications
+from src.core.notifications.dispatcher import summarize
+import uuid
+import asyncio
+
+class MonitorTask:
+    """One product watch: checks, transitions, add-to-cart and notifications.
+
+    Free of Qt so it runs the same under the GUI and in headless mode. Table
+    values are reported to a status sink (the GUI's status bus, or a
+    logging sink when headless). MonitorScheduler drives its checks.
+    """
+
+    running_tasks = set()
+    # Under the scheduler a busy pool fails fast and the open is requeued
+    SESSION_ACQUIRE_TIMEOUT = 5
+    # Network errors on the HTTP fast path: after this many in a row, use the browser for a while
+    HTTP_FAILURE_LIMIT = 3
+    HTTP_RETRY_AFTER = 300
+
+    def __init__(self, driver_path, persistence_manager, url, check_interval=30, driver_pool=None,
+                 http_monitor=None, launch_time=None, task_id=None, last_product_info=None, last_availability=None,
+                 status_sink=None):
+        self.driver_path = driver_path
+        self.driver_pool = driver_pool
+        self.http_monitor = http_monitor
+        # Set when the page can't be parsed without a browser; network errors only pause HTTP
+        self.http_failed = False
+        self.http_failures = 0
+        self.http_retry_at = 0.0
+        self.status_sink = status_sink or LoggingStatusSink()
+        self.persistence_manager = persistence_manager
+        self.url = url
+        self.check_interval = check_interval
+        self.keep_running = True
+        # Set by MonitorScheduler when the task runs on the shared scheduler instead of its own thread
+        self.scheduler = None
+        self.task_id = task_id or str(uuid.uuid4())
+        self.web_monitor = None
+        # Restored from the checkpoint so the table shows the last known state right away
+        self.last_availability = last_availability
+        self.last_product_info = last_product_info
+        # The restored availability is only shown; the first check treats it as unknown so a
+        # drop still live after a restart gets its alert and cart attempt
+        self.availability_confirmed = False
+        self.availability_event_id = None
+        # Launch-time precision mode: ramps the polling rate around a drop
+        self.launch_time = launch_time
+        self.launch_schedule = LaunchSchedule(launch_time, check_interval) if launch_time else None
+
+        self.tracer = get_tracer()
+
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.INFO)
+
+        MonitorTask.running_tasks.add(self.task_id)
+        if self.persistence_manager:
+            self.persistence_manager.record_add(self.to_monitoring_task())
+
+    def publish(self, field, value):
+        """Report a table value for this task"""
+        self.status_sink.publish(self.task_id, field, value)
+
+    def to_monitoring_task(self):
+        """Checkpointable state of this task"""
+        launch_time = self.launch_time
+        if isinstance(launch_time, datetime):
+            launch_time = launch_time.timestamp()
+        return MonitoringTask(
+            url=self.url,
+            interval=self.check_interval,
+            task_id=self.task_id,
+            launch_time=launch_time,
+            last_product_info=self.last_product_info,
+            last_availability=self.last_availability
+        )
+
+    def restored_status(self):
+        """Table values for a task restored with a known last state"""
+        if not self.last_product_info:
+            return "Loading", "Searching"
+        status = "Available" if self.last_availability else "Unavailable"
+        return self.last_product_info.get('name', 'Unknown'), status
+
+    def on_task_error(self, error):
+        """Mark the task as failed once it gives up"""
+        self.logger.error(f"Error in monitoring task: {error}")
+        self.publish('monitoring_status', "Error")
+        MonitorTask.running_tasks.discard(self.task_id)
+
+    def open_session(self):
+        """Lease a browser (or tab), open the product page and share its cookies"""
+        with self.tracer.phase('open_session', self.task_id):
+            self._open_session()
+
+    def _open_session(self):
+        self.logger.info("Initializing browser and opening URL")
+        timeout = self.SESSION_ACQUIRE_TIMEOUT if self.scheduler else None
+        if self.driver_pool and self.driver_pool.multiplexed:
+            # Shared browser: this task only owns one tab in it
+            self.web_monitor = self.driver_pool.acquire_tab(self.task_id, self.url, timeout=timeout)
+        elif self.driver_pool:
+            self.web_monitor = self.driver_pool.acquire(timeout=timeout)
+            self.web_monitor.open_url(self.url)
+        else:
+            # Imported here so selenium only loads once a browser is actually needed
+            from src.core.managers.web_monitor import WebMonitor
+            self.web_monitor = WebMonitor(self.driver_path)
+            self.web_monitor.open_url(self.url)
+
+        if self.http_monitor:
+            self.http_monitor.load_cookies(self.web_monitor.export_cookies())
+
+    def close_session(self):
+        """Give the browser back to the pool, or quit it when not pooled"""
+        if self.web_monitor and self.driver_pool and self.driver_pool.multiplexed:
+            self.driver_pool.release_tab(self.web_monitor, self.task_id)
+        elif self.web_monitor and self.driver_pool:
+            self.driver_pool.release(self.web_monitor)
+        elif self.web_monitor:
+            self.web_monitor.cleanup()
+        self.web_monitor = None
+        self.logger.info("Browser cleanup completed")
+
+    def current_interval(self):
+        """Seconds until the next check, following the launch ramp when one is set"""
+        if self.launch_schedule:
+            return self.launch_schedule.interval_at()
+        return self.check_interval
+
+    def prewarm(self):
+        """Freshen the browser page and HTTP cookies shortly before launch"""
+        self.logger.info("Pre-warming session ahead of launch")
+        self.launch_schedule.prewarmed = True
+        try:
+            if self.task_id in self.web_monitor.tabs:
+                with self.web_monitor.use_tab(self.task_id):
+                    self.web_monitor.driver.refresh()
+                    self.web_monitor.wait_for_page_load()
+            else:
+                self.web_monitor.driver.refresh()
+                self.web_monitor.wait_for_page_load()
+            if self.http_monitor:
+                self.http_monitor.load_cookies(self.web_monitor.export_cookies())
+        except Exception as e:
+            self.logger.warning(f"Pre-warm failed: {e}")
+
+    def check_once(self, reload=True):
+        """Run one availability check and react to status transitions"""
+        try:
+            with self.tracer.phase('check', self.task_id):
+                product_info = self._check_once(reload)
+        except Exception:
+            CHECKS.inc(result="error")
+            raise
+        CHECKS.inc(result="ok")
+        CHECKS_PER_SECOND.mark()
+        return product_info
+
+    def _check_once(self, reload):
+        if self.launch_schedule and self.launch_schedule.prewarm_due():
+            self.prewarm()
+        product_info = self.fetch_product_info(reload=reload)
+        available = self.is_available(product_info)
+        self.publish('product_name', product_info.get('name', 'Unknown'))
+
+        previous = self.last_availability if self.availability_confirmed else None
+        self.availability_confirmed = True
+        if available == previous:
+            return product_info
+        self.last_availability = available
+        self.last_product_info = product_info
+        if previous is not None:
+            # The first observation after a start or restore is not a change
+            TRANSITIONS.inc(to="available" if available else "unavailable")
+        if self.persistence_manager:
+            self.persistence_manager.record_state(self.task_id, product_info, available)
+
+        if not available:
+            self.publish('product_status', "Unavailable")
+            return product_info
+
+        self.publish('product_status', "Available")
+        self.availability_event_id = f"available-{int(time.time() * 1000)}"
+        if self.launch_schedule:
+            # During a drop every millisecond counts, so cart first and notify after
+            self.add_to_cart(product_info)
+            self.notify_available(product_info)
+        else:
+            self.logger.info("Product Available - Sending Notification")
+            self.notify_available(product_info)
+            self.add_to_cart(product_info)
+        return product_info
+
+    def add_to_cart(self, product_info):
+        """Click Add to Cart and record the timing against the launch target"""
+        # The browser page is stale when the info came from the HTTP fast path
+        CART_ATTEMPTS.inc()
+        clicked = self.click_add_to_cart_button(refresh=product_info.get('source') == 'http')
+        if self.launch_schedule:
+            self.launch_schedule.record_fire()
+        if clicked:
+            CART_SUCCESSES.inc()
+            self.logger.info("Successfully clicked Add to Cart button")
+        else:
+            self.logger.warning("Failed to click Add to Cart button")
+            self.publish('monitoring_status', "Failed to Add to Cart")
+        return clicked
+
+    @staticmethod
+    def is_available(product_info):
+        """A product is in stock when an enabled Add to Cart button is shown"""
+        if 'ADD TO CART' not in str(product_info.get('cart_button', '')).upper():
+            return False
+        return bool(product_info.get('cart_button_enabled', True))
+
+    def notify_available(self, product_info):
+        """Send the stock alert to every Telegram subscriber"""
+        progress = {'sent': 0, 'failed': 0, 'shown_at': 0.0}
+
+        def on_result(result):
+            progress['sent' if result["success"] else 'failed'] += 1
+            if not result["success"]:
+                self.logger.error(f"Failed to send to chat ID {result['chat_id']}: {result.get('error')}")
+            # Throttle table updates while a large fan-out is in flight
+            now = time.monotonic()
+            if now - progress['shown_at'] >= 0.5:
+                progress['shown_at'] = now
+                self.publish('notification_status', f"Sending ({progress['sent']} sent, {progress['failed']} failed)")
+
+        def on_complete(results):
+            self.publish('notification_status', summarize(results))
+
+        # Published before enqueueing so delivery callbacks always overwrite it
+        self.publish('notification_status', "Queued")
+        try:
+            # Returns once the alert is stored in the outbox; delivery reports through the callbacks
+            with self.tracer.phase('notify'):
+                asyncio.run(send_notifications(
+                    product_info.get('name', 'Unknown'),
+                    self.url,
+                    product_info.get('size_options', ''),
+                    on_result=on_result,
+                    on_complete=on_complete,
+                    # One event per availability transition, so retries never double-notify
+                    event_id=self.availability_event_id
+                ))
+        except Exception as e:
+            self.logger.error(f"Error sending notifications: {e}")
+            self.publish('notification_status', "Error")
+
+    def retune(self, interval):
+        """Change the check interval of a running task and checkpoint it"""
+        self.check_interval = interval
+        if self.launch_schedule:
+            self.launch_schedule.base_interval = float(interval)
+        if self.scheduler:
+            self.scheduler.retune_task(self.task_id, self.current_interval())
+        if self.persistence_manager:
+            self.persistence_manager.record_retune(self.task_id, interval)
+
+    def stop(self, task_id=None):
+        """Stop polling; the scheduler drops the task before its next check"""
+        if task_id is None:
+            task_id = self.task_id
+        self.logger.info('Task is being stopped')
+        self.keep_running = False
+        if self.scheduler:
+            self.scheduler.remove_task(task_id)
+        MonitorTask.running_tasks.discard(task_id)
+
+    def fetch_product_info(self, reload=True):
+        """Fetch product info over HTTP, escalating to the browser when parsing fails"""
+        if self.http_monitor and not self.http_failed and time.monotonic() >= self.http_retry_at:
+            try:
+                with self.tracer.phase('http_fetch'):
+                    product_info = self.http_monitor.fetch_product_info(self.url)
+                self.http_failures = 0
+                return product_info
+            except ProductParseError as e:
+                # Stay on the browser path for this task from now on
+                self.logger.warning(f"HTTP fast path can't parse the page, falling back to browser: {e}")
+                self.http_failed = True
+                reload = True
+            except requests.RequestException as e:
+                # Use the browser for this check only, or for a while after repeated errors
+                self.http_failures += 1
+                if self.http_failures >= self.HTTP_FAILURE_LIMIT:
+                    self.logger.warning(f"HTTP fast path failed {self.http_failures} times in a row, "
+                                        f"using the browser for {self.HTTP_RETRY_AFTER}s: {e}")
+                    self.http_failures = 0
+                    self.http_retry_at = time.monotonic() + self.HTTP_RETRY_AFTER
+                else:
+                    self.logger.warning(f"HTTP fast path failed, checking in the browser: {e}")
+                reload = True
+        if self.task_id in self.web_monitor.tabs:
+            return self.web_monitor.fetch_tab_info(self.task_id, reload=reload)
+        if reload:
+            self.web_monitor.driver.refresh()
+            self.web_monitor.wait_for_page_load()
+        return self.web_monitor.fetch_product_info()
+
+    def click_add_to_cart_button(self, refresh=False):
+        """Click Add to Cart, focusing this task's tab first when multiplexed"""
+        if self.task_id in self.web_monitor.tabs:
+            with self.web_monitor.use_tab(self.task_id):
+                if refresh:
+                    self.web_monitor.driver.refresh()
+                    self.web_monitor.wait_for_page_load()
+                return self.web_monitor.click_add_to_cart_button()
+        if refresh:
+            self.web_monitor.driver.refresh()
+            self.web_monitor.wait_for_page_load()
+        return self.web_monitor.click_add_to_cart_button()
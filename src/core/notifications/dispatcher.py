@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import random
+import time
+from src.core.managers.metrics import NOTIFICATIONS, NOTIFICATION_RETRIES
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Async token bucket; must be used from a single event loop"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def is_idle(self, now):
+        """Full and not blocked, so dropping it loses no rate-limit state"""
+        return now >= self.blocked_until and self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+    def block_for(self, seconds):
+        """Stop handing out tokens for a while (Telegram asked us to back off)"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+class NotificationDispatcher:
+    """Delivers messages at the highest rate Telegram accepts.
+
+    A global bucket caps total sends per second and a bucket per chat caps
+    sends to any one chat. 429 responses pause the relevant bucket for the
+    retry_after Telegram returns; network and 5xx errors are retried with
+    exponential backoff. Client errors such as a user blocking the bot are
+    not retried. Per-chat buckets that sit idle and full are evicted.
+    """
+
+    GLOBAL_RATE = 30
+    PER_CHAT_RATE = 1
+    MAX_RETRIES = 5
+    BASE_BACKOFF = 0.5
+    BUCKET_SWEEP_INTERVAL = 60
+
+    def __init__(self, client, global_rate=GLOBAL_RATE, per_chat_rate=PER_CHAT_RATE, max_retries=MAX_RETRIES):
+        self.client = client
+        self.global_rate = global_rate
+        self.per_chat_rate = per_chat_rate
+        self.max_retries = max_retries
+        # Created lazily on the client loop
+        self._global_bucket = None
+        self._chat_buckets = {}
+        # Deliveries in flight per chat; their buckets are never evicted
+        self._active_chats = {}
+        self._next_sweep = 0.0
+
+    def _chat_bucket(self, chat_id):
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(self.per_chat_rate, capacity=1)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    def _sweep_buckets(self):
+        """Forget chat buckets with nothing left to enforce"""
+        now = time.monotonic()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.BUCKET_SWEEP_INTERVAL
+        idle = [chat_id for chat_id, bucket in self._chat_buckets.items()
+                if chat_id not in self._active_chats and bucket.is_idle(now)]
+        for chat_id in idle:
+            del self._chat_buckets[chat_id]
+
+    async def _deliver(self, chat_id, text, parse_mode):
+        chat_bucket = self._chat_bucket(chat_id)
+        result = None
+        for attempt in range(1, self.max_retries + 1):
+            if attempt > 1:
+                NOTIFICATION_RETRIES.inc()
+            await chat_bucket.acquire()
+            await self._global_bucket.acquire()
+            result = await self.client.send_message(chat_id, text, parse_mode)
+            result["attempts"] = attempt
+            if result["success"]:
+                NOTIFICATIONS.inc(status="sent")
+                return result
+
+            status_code = result.get("status_code")
+            if status_code == 429:
+                retry_after = float(result.get("retry_after") or 1)
+                logger.warning(f"Rate limited sending to {chat_id}, retrying after {retry_after}s")
+                # Without a chat-specific hint Telegram's flood limit is treated as global
+                self._global_bucket.block_for(retry_after)
+                chat_bucket.block_for(retry_after)
+                continue
+            if status_code is None or status_code >= 500:
+                delay = self.BASE_BACKOFF * (2 ** (attempt - 1)) * (1 + random.random())
+                await asyncio.sleep(delay)
+                continue
+            # 400/403 etc. will not succeed on retry
+            break
+        NOTIFICATIONS.inc(status="failed")
+        return result
+
+    async def _dispatch(self, chat_ids, text, parse_mode, on_result):
+        if self._global_bucket is None:
+            self._global_bucket = TokenBucket(self.global_rate)
+        self._sweep_buckets()
+
+        async def deliver(chat_id):
+            self._active_chats[chat_id] = self._active_chats.get(chat_id, 0) + 1
+            try:
+                result = await self._deliver(chat_id, text, parse_mode)
+            finally:
+                remaining = self._active_chats.pop(chat_id) - 1
+                if remaining:
+                    self._active_chats[chat_id] = remaining
+            if on_result:
+                try:
+                    on_result(result)
+                except Exception as e:
+                    logger.error(f"Error in delivery callback: {e}")
+            return result
+
+        return await asyncio.gather(*[deliver(chat_id) for chat_id in chat_ids])
+
+    async def dispatch(self, chat_ids, text, parse_mode="Markdown", on_result=None):
+        """Deliver one message to every chat; on_result is called per chat as it settles"""
+        return await self.client.run(self._dispatch(list(chat_ids), text, parse_mode, on_result))
+
+
+def summarize(results):
+    """Collapse per-chat results into the Notification column text"""
+    total = len(results)
+    sent = sum(1 for result in results if result["success"])
+    if total and sent == total:
+        return "Sent"
+    if sent:
+        return f"Partial ({sent}/{total})"
+    return "Failed"
+
+
+_dispatchers = {}
+
+
+def get_dispatcher(client):
+    """One dispatcher per client so rate limits are shared by every caller"""
+    dispatcher = _dispatchers.get(id(client))
+    if dispatcher is None or dispatcher.client is not client:
+        dispatcher = NotificationDispatcher(client)
+        _dispatchers[id(client)] = dispatcher
+    return dispatcher
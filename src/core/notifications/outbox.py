@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from src.core.managers.json_file_handler import get_app_data_path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    chat_id INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (status, next_attempt);
+"""
+
+
+class NotificationOutbox:
+    """Durable, at-least-once delivery queue for notifications.
+
+    enqueue() only puts a tuple on an in-memory queue, so it never blocks the
+    monitor. A writer thread persists batches into a SQLite WAL table with one
+    row per (product, chat, event) idempotency key, and a drainer thread
+    delivers pending rows, marking them sent only after Telegram accepted
+    them. Rows left pending by a crash are delivered on the next start.
+    Settled rows older than PURGE_AFTER are deleted by the drainer.
+    """
+
+    MAX_ATTEMPTS = 10
+    RETRY_BACKOFF = 5
+    BATCH_SIZE = 500
+    PURGE_AFTER = 7 * 24 * 3600
+    PURGE_INTERVAL = 3600
+
+    def __init__(self, deliver, db_path=None, poll_interval=1.0):
+        # deliver(chat_ids, text, on_result) -> coroutine returning per-chat result dicts
+        self.deliver = deliver
+        self.db_path = db_path or os.path.join(get_app_data_path(), 'notification_outbox.db')
+        self.poll_interval = poll_interval
+        self._incoming = queue.SimpleQueue()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        # Futures of in-process callers, and which idempotency keys each one waits on
+        self._waiters = {}
+        self._key_owners = {}
+        self._waiters_lock = threading.Lock()
+        self._threads = []
+
+    def _connect(self):
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def start(self):
+        if self._threads:
+            return
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+        for target, name in ((self._write_loop, "outbox-writer"), (self._drain_loop, "outbox-drainer")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Notification outbox started at {self.db_path}")
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._incoming.put(None)
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    @staticmethod
+    def idempotency_key(product_key, chat_id, event_id):
+        return f"{product_key}|{chat_id}|{event_id}"
+
+    def enqueue(self, product_key, event_id, chat_ids, text, on_result=None, on_complete=None):
+        """Queue one message per chat; the returned Future resolves once the rows are committed.
+
+        on_result(result) is called per chat as its first delivery attempt
+        settles, and on_complete(results) once every chat has settled.
+        """
+        committed = Future()
+        if not chat_ids:
+            committed.set_result(0)
+            if on_complete:
+                on_complete([])
+            return committed
+        keys = [self.idempotency_key(product_key, chat_id, event_id) for chat_id in chat_ids]
+        waiter_id = id(committed)
+        with self._waiters_lock:
+            self._waiters[waiter_id] = {'pending': set(keys), 'results': [],
+                                        'on_result': on_result, 'on_complete': on_complete}
+            for key in keys:
+                self._key_owners.setdefault(key, []).append(waiter_id)
+        self._incoming.put((keys, list(chat_ids), text, time.time(), committed, waiter_id))
+        return committed
+
+    # ---- writer ----------------------------------------------------------
+
+    def _write_loop(self):
+        connection = self._connect()
+        while not self._stop.is_set():
+            item = self._incoming.get()
+            batch = [item]
+            # Coalesce whatever else arrived into the same transaction
+            while True:
+                try:
+                    batch.append(self._incoming.get_nowait())
+                except queue.Empty:
+                    break
+            rows = []
+            entries = [entry for entry in batch if entry is not None]
+            for keys, chat_ids, text, created_at, _, _ in entries:
+                rows.extend((key, chat_id, text, created_at) for key, chat_id in zip(keys, chat_ids))
+            if rows:
+                try:
+                    with connection:
+                        connection.executemany(
+                            "INSERT OR IGNORE INTO outbox (idempotency_key, chat_id, text, created_at) "
+                            "VALUES (?, ?, ?, ?)",
+                            rows
+                        )
+                except sqlite3.Error as e:
+                    logger.error(f"Error writing to notification outbox: {e}")
+                    self._fail_entries(entries, e)
+                    continue
+                for keys, _, _, _, committed, _ in entries:
+                    committed.set_result(len(keys))
+                try:
+                    self._settle_duplicates(connection, [row[0] for row in rows])
+                except sqlite3.Error as e:
+                    logger.error(f"Error checking notification outbox for duplicates: {e}")
+                self._wakeup.set()
+        connection.close()
+
+    def _fail_entries(self, entries, error):
+        """Nothing of a failed batch was stored: fail every caller waiting on it"""
+        with self._waiters_lock:
+            for keys, _, _, _, _, waiter_id in entries:
+                self._waiters.pop(waiter_id, None)
+                for key in keys:
+                    owners = self._key_owners.get(key)
+                    if owners and waiter_id in owners:
+                        owners.remove(waiter_id)
+                        if not owners:
+                            del self._key_owners[key]
+        for _, _, _, _, committed, _ in entries:
+            committed.set_exception(error)
+
+    def _settle_duplicates(self, connection, keys):
+        """Keys that were already delivered earlier are reported without resending"""
+        for start in range(0, len(keys), self.BATCH_SIZE):
+            chunk = keys[start:start + self.BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            done = connection.execute(
+                f"SELECT idempotency_key, chat_id, status FROM outbox "
+                f"WHERE status != 'pending' AND idempotency_key IN ({placeholders})",
+                chunk
+            ).fetchall()
+            for key, chat_id, status in done:
+                self._settle(key, {"chat_id": chat_id, "success": status == 'sent', "duplicate": True,
+                                   "error": None if status == 'sent' else "Previously failed"})
+
+    # ---- drainer ---------------------------------------------------------
+
+    def _drain_loop(self):
+        connection = self._connect()
+        next_purge = 0
+        while not self._stop.is_set():
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            try:
+                while self._drain_once(connection):
+                    pass
+                if time.monotonic() >= next_purge:
+                    next_purge = time.monotonic() + self.PURGE_INTERVAL
+                    self.purge_sent(connection=connection)
+            except Exception as e:
+                logger.error(f"Error draining notification outbox: {e}")
+        connection.close()
+
+    def _drain_once(self, connection):
+        rows = connection.execute(
+            "SELECT id, idempotency_key, chat_id, text, attempts FROM outbox "
+            "WHERE status = 'pending' AND next_attempt <= ? ORDER BY id LIMIT ?",
+            (time.time(), self.BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            return False
+
+        # Rows sharing a text are one fan-out
+        by_text = {}
+        for row in rows:
+            by_text.setdefault(row[3], []).append(row)
+
+        for text, group in by_text.items():
+            # A chat with two pending events for the same text gets the second one next round
+            by_chat = {}
+            for row in group:
+                by_chat.setdefault(row[2], row)
+
+            def on_result(result, by_chat=by_chat):
+                self._settle(by_chat[result['chat_id']][1], result)
+
+            results = asyncio.run(self.deliver(list(by_chat), text, on_result))
+            updates = []
+            for result in results:
+                row_id, _, _, _, attempts = by_chat[result['chat_id']]
+                attempts += result.get('attempts', 1)
+                if result['success']:
+                    updates.append(('sent', attempts, 0, None, row_id))
+                elif self._retryable(result) and attempts < self.MAX_ATTEMPTS:
+                    next_attempt = time.time() + self.RETRY_BACKOFF * attempts
+                    updates.append(('pending', attempts, next_attempt, result.get('error'), row_id))
+                else:
+                    updates.append(('failed', attempts, 0, result.get('error'), row_id))
+            with connection:
+                connection.executemany(
+                    "UPDATE outbox SET status = ?, attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+                    updates
+                )
+        return len(rows) == self.BATCH_SIZE
+
+    @staticmethod
+    def _retryable(result):
+        status_code = result.get('status_code')
+        return status_code is None or status_code == 429 or status_code >= 500
+
+    def _settle(self, key, result):
+        """Report a delivery attempt to whoever enqueued it in this process"""
+        callbacks = []
+        with self._waiters_lock:
+            for owner in self._key_owners.pop(key, []):
+                waiter = self._waiters.get(owner)
+                if not waiter:
+                    continue
+                waiter['pending'].discard(key)
+                waiter['results'].append(result)
+                if waiter['on_result']:
+                    callbacks.append((waiter['on_result'], result))
+                if not waiter['pending']:
+                    del self._waiters[owner]
+                    if waiter['on_complete']:
+                        callbacks.append((waiter['on_complete'], waiter['results']))
+        for callback, argument in callbacks:
+            try:
+                callback(argument)
+            except Exception as e:
+                logger.error(f"Error in delivery callback: {e}")
+
+    def purge_sent(self, older_than=None, connection=None):
+        """Drop settled rows older than older_than seconds (PURGE_AFTER by default)"""
+        older_than = self.PURGE_AFTER if older_than is None else older_than
+        own_connection = connection is None
+        connection = connection or self._connect()
+        try:
+            with connection:
+                deleted = connection.execute(
+                    "DELETE FROM outbox WHERE status != 'pending' AND created_at < ?",
+                    (time.time() - older_than,)
+                ).rowcount
+        finally:
+            if own_connection:
+                connection.close()
+        if deleted:
+            logger.info(f"Purged {deleted} settled row(s) from the notification outbox")
+        return deleted
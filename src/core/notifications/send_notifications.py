@@ -1,75 +1,113 @@
 import asyncio
-import json
-import requests
+import threading
+import time
 from typing import Dict
-from src.core.managers.json_file_handler import get_json_path
+from src.core.managers.config_service import get_telegram_config
+from src.core.notifications.telegram_client import get_client
+from src.core.notifications.dispatcher import get_dispatcher
+from src.core.notifications.outbox import NotificationOutbox
+from src.core.notifications.subscriber_store import get_subscriber_store
 # Load Bot Token from the JSON file
-BOT_TOKEN_FILE = get_json_path("telegram_config.json")
 
 def load_bot_config() -> Dict:
-    with open(BOT_TOKEN_FILE, 'r') as f:
-        return json.load(f)
+    return get_telegram_config().snapshot()
 
-# Load token from configuration
-bot_token_config = load_bot_config()
-BOT_TOKEN = bot_token_config.get('bot_token','')
-print(f"bot_token is {BOT_TOKEN}")
-
-# Load chat IDs from file
-CHAT_IDS_FILE = get_json_path("chat_ids.json")
+def bot_token() -> str:
+    """Current bot token; follows edits to telegram_config.json without a restart."""
+    return get_telegram_config().get('bot_token', '')
 
 def load_chat_ids():
     """Load chat IDs of users who initiated a chat with the bot."""
-    try:
-        with open(CHAT_IDS_FILE, "r") as file:
-            return json.load(file)
-    except FileNotFoundError:
-        return []
+    # Served from the in-memory subscriber index, no disk read per alert
+    return get_subscriber_store().chat_ids()
 
-async def send_message_async(chat_id, product_title, product_url,formatted_products):
-    """Send a notification to a single Telegram user."""
-    message_body = (
+# Connection limit of the shared keep-alive session to api.telegram.org
+MAX_CONNECTIONS = 50
+
+def format_message(product_title, product_url, formatted_products):
+    """Build the stock alert text."""
+    return (
         f"🔔 *Product Alert!*\n\n"
         f"*Product Name:* \n\n{product_title}\n\n"
         f"*Status:* Available now\n\n"
         f"*Available Stocks:*\n\n{formatted_products}\n\n"
         f"[Click here to buy the product]({product_url})"
     )
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-    payload = {
-        "chat_id": chat_id,
-        "text": message_body,
-        "parse_mode": "Markdown",
-    }
-    try:
-        response = await asyncio.to_thread(requests.post, url, json=payload)
-        if response.status_code == 200:
-            return {"chat_id": chat_id, "success": True, "message_id": response.json().get("result", {}).get("message_id")}
-        else:
-            return {"chat_id": chat_id, "success": False, "error": response.json().get("description", "Unknown error")}
-    except Exception as e:
-        return {"chat_id": chat_id, "success": False, "error": str(e)}
 
-async def send_notifications(product_title, product_url, formatted_products):
-    chat_ids_list = load_chat_ids()  # Loads list of user dictionaries
-    if not chat_ids_list:
+def telegram_client():
+    """Shared Bot API client; api_base in telegram_config.json can point it at a local stand-in"""
+    return get_client(bot_token(), max_connections=MAX_CONNECTIONS, api_base=get_telegram_config().get('api_base'))
+
+def _on_config_change(old_config, new_config):
+    """Point the shared client at a changed bot token or api_base"""
+    if all(old_config.get(key) == new_config.get(key) for key in ('bot_token', 'api_base')):
+        return
+    telegram_client()
+
+async def send_message_async(chat_id, product_title, product_url,formatted_products):
+    """Send a notification to a single Telegram user."""
+    client = telegram_client()
+    return await client.send_message(chat_id, format_message(product_title, product_url, formatted_products))
+
+async def _deliver(chat_ids, message_body, on_result):
+    """Outbox delivery hook: rate-limited fan-out over the pooled client."""
+    client = telegram_client()
+    return await get_dispatcher(client).dispatch(chat_ids, message_body, on_result=on_result)
+
+_outbox = None
+_outbox_lock = threading.Lock()
+_config_subscribed = False
+
+def get_outbox():
+    """Return the durable outbox, starting its threads on first use."""
+    global _outbox, _config_subscribed
+    with _outbox_lock:
+        if _outbox is None:
+            if not _config_subscribed:
+                config = get_telegram_config()
+                config.subscribe(_on_config_change)
+                config.start()
+                _config_subscribed = True
+            _outbox = NotificationOutbox(_deliver)
+            _outbox.start()
+        return _outbox
+
+def stop_outbox():
+    global _outbox
+    with _outbox_lock:
+        if _outbox is not None:
+            _outbox.stop()
+            _outbox = None
+
+async def send_notifications(product_title, product_url, formatted_products, on_result=None, on_complete=None,
+                             event_id=None):
+    """Queue the stock alert for every subscriber; returns the number of chats once it is stored.
+
+    Messages go through the durable outbox keyed on (product, chat, event),
+    so a repeated event_id never notifies a chat twice and undelivered
+    alerts survive a restart. Delivery happens later on the outbox threads:
+    on_result is called with each chat's result as soon as that delivery
+    settles, and on_complete with all results after the first round.
+    """
+    chat_ids = load_chat_ids()
+    if not chat_ids:
         print("No users available")
-        return []
-
-    # Extract just the chat_ids from user dictionaries
-    chat_ids = [user['chat_id'] for user in chat_ids_list]
-    
-    tasks = [
-        send_message_async(chat_id, product_title, product_url, formatted_products)
-        for chat_id in chat_ids
-    ]
-    
-    results = await asyncio.gather(*tasks)
-    
-    for result in results:
+        if on_complete:
+            on_complete([])
+        return 0
+
+    message_body = format_message(product_title, product_url, formatted_products)
+    if event_id is None:
+        event_id = f"available-{int(time.time())}"
+
+    def log_result(result):
         if result["success"]:
             print(f"Message sent to {result['chat_id']}")
         else:
             print(f"Failed to send to {result['chat_id']}: {result['error']}")
-            
-    return results
\ No newline at end of file
+        if on_result:
+            on_result(result)
+
+    committed = get_outbox().enqueue(product_url, event_id, chat_ids, message_body,
+                                     on_result=log_result, on_complete=on_complete)
+    return await asyncio.wrap_future(committed)
\ No newline at end of file
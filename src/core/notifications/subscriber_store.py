@@ -0,0 +1,184 @@
+import json
+import logging
+import os
+import threading
+from src.core.managers.json_file_handler import get_json_path
+from src.core.managers.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriberStore:
+    """In-memory index of bot subscribers with incremental persistence.
+
+    chat_ids.json stays the snapshot (same list-of-users format as before).
+    Changes are appended to a journal next to it, so subscribe and
+    unsubscribe cost one dict update and one short append instead of a full
+    reload and rewrite. The journal is folded back into the snapshot once
+    it grows past compact_threshold entries.
+    """
+
+    def __init__(self, file_path=None, journal_path=None, compact_threshold=500):
+        self.file_path = file_path or get_json_path("chat_ids.json")
+        self.journal_path = journal_path or self.file_path + ".journal"
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._users = {}
+        self._chat_ids = None
+        self._journal_entries = 0
+        self._listeners = []
+        self.load()
+
+    @staticmethod
+    def _key(chat_id):
+        try:
+            return int(chat_id)
+        except (TypeError, ValueError):
+            return chat_id
+
+    def load(self):
+        """Read the snapshot and replay the journal on top of it"""
+        with self._lock:
+            self._users = {}
+            try:
+                with open(self.file_path, 'r') as f:
+                    content = f.read().strip()
+                for user in json.loads(content) if content else []:
+                    self._users[self._key(user['chat_id'])] = user
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.error(f"Error loading chat IDs: {e}")
+
+            self._journal_entries = 0
+            try:
+                with open(self.journal_path, 'r') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            # A torn last line from a crash is skipped
+                            continue
+                        self._apply(entry)
+                        self._journal_entries += 1
+            except FileNotFoundError:
+                pass
+            self._chat_ids = None
+
+        if self._journal_entries >= self.compact_threshold:
+            self.compact()
+        logger.info(f"Loaded {len(self._users)} subscribers")
+
+    def _apply(self, entry):
+        if entry.get('op') == 'add':
+            user = entry['user']
+            self._users[self._key(user['chat_id'])] = user
+        elif entry.get('op') == 'remove':
+            self._users.pop(self._key(entry['chat_id']), None)
+        elif entry.get('op') == 'clear':
+            self._users.clear()
+
+    def _append(self, entry):
+        with open(self.journal_path, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_entries += 1
+
+    def _changed(self, event, chat_id):
+        self._chat_ids = None
+        for listener in list(self._listeners):
+            try:
+                listener(event, chat_id)
+            except Exception as e:
+                logger.error(f"Error in subscriber listener: {e}")
+        if self._journal_entries >= self.compact_threshold:
+            self.compact()
+
+    # ---- queries ---------------------------------------------------------
+
+    def contains(self, chat_id):
+        return self._key(chat_id) in self._users
+
+    def get(self, chat_id):
+        return self._users.get(self._key(chat_id))
+
+    def all(self):
+        with self._lock:
+            return list(self._users.values())
+
+    def chat_ids(self):
+        """Cached list of chat ids for the notifier; rebuilt only after a change"""
+        chat_ids = self._chat_ids
+        if chat_ids is None:
+            with self._lock:
+                chat_ids = self._chat_ids = list(self._users)
+        return chat_ids
+
+    def __len__(self):
+        return len(self._users)
+
+    # ---- updates ---------------------------------------------------------
+
+    def add(self, chat_id, username, first_name, last_name):
+        """Add a subscriber; returns False if they were already subscribed"""
+        user = {
+            'chat_id': chat_id,
+            'username': username,
+            'first_name': first_name,
+            'last_name': last_name
+        }
+        with self._lock:
+            if self._key(chat_id) in self._users:
+                return False
+            self._append({'op': 'add', 'user': user})
+            self._users[self._key(chat_id)] = user
+            self._changed('add', chat_id)
+        return True
+
+    def remove(self, chat_id):
+        """Remove a subscriber; returns False if they were not subscribed"""
+        with self._lock:
+            if self._key(chat_id) not in self._users:
+                return False
+            self._append({'op': 'remove', 'chat_id': self._key(chat_id)})
+            self._users.pop(self._key(chat_id), None)
+            self._changed('remove', chat_id)
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._append({'op': 'clear'})
+            self._users.clear()
+            self._changed('clear', None)
+
+    def subscribe(self, listener):
+        """Call listener(event, chat_id) after every add, remove or clear"""
+        self._listeners.append(listener)
+
+    def compact(self):
+        """Fold the journal into chat_ids.json and start a fresh journal"""
+        with self._lock:
+            try:
+                get_storage().write_json(self.file_path, list(self._users.values()))
+                open(self.journal_path, 'w').close()
+                self._journal_entries = 0
+                logger.info(f"Compacted subscriber store ({len(self._users)} users)")
+            except Exception as e:
+                logger.error(f"Error compacting subscriber store: {e}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_subscriber_store():
+    """Process-wide store shared by the bot, the notifier and the GUI"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SubscriberStore()
+        return _store
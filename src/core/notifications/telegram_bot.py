@@ -1,12 +1,12 @@
 from telegram import Update
 from telegram.ext import ApplicationBuilder, CommandHandler, CallbackContext, ConversationHandler, MessageHandler, filters
-import json
 import logging
-import os
 import asyncio
 import nest_asyncio
 import re
 from src.core.managers.json_file_handler import get_json_path
+from src.core.notifications.subscriber_store import get_subscriber_store
+from src.core.managers.config_service import get_telegram_config
 from httpx import ConnectTimeout
 
 # Apply nest_asyncio
@@ -24,45 +24,18 @@ logger = logging.getLogger(__name__)
 
 # Constants
 CHAT_IDS_FILE = get_json_path("chat_ids.json")
-BOT_TOKEN_FILE = get_json_path("telegram_config.json")
 
 # Helper Functions
 def load_bot_config() -> dict:
-    with open(BOT_TOKEN_FILE, 'r') as f:
-        return json.load(f)
+    # Cached and hot-reloaded; no disk read per message
+    return get_telegram_config().snapshot()
 
 def load_chat_ids() -> list:
-    try:
-        if not os.path.exists(CHAT_IDS_FILE):
-            with open(CHAT_IDS_FILE, 'w') as f:
-                json.dump([], f)
-            return []
-
-        with open(CHAT_IDS_FILE, 'r') as f:
-            chat_ids = json.load(f)
-        return chat_ids
-    except Exception as e:
-        logger.error(f"Error loading chat IDs: {e}")
-        return []
+    return get_subscriber_store().all()
 
 def save_new_user(chat_id, username, firt_name,last_name):
    try:
-       # Load existing users
-       chat_ids = load_chat_ids()
-       
-       # Add new user
-       new_user = {
-           'chat_id': chat_id,
-           'username': username,
-           'first_name': firt_name,
-           'last_name':last_name
-       }
-       chat_ids.append(new_user)
-       
-       # Save updated list
-       with open(CHAT_IDS_FILE, 'w') as f:
-           json.dump(chat_ids, f, indent=4)
-           
+       get_subscriber_store().add(chat_id, username, firt_name, last_name)
    except Exception as e:
        logger.error(f"Error saving new user: {e}")
 
@@ -101,15 +74,11 @@ async def check_password(update: Update, context: CallbackContext) -> int:
         last_name = clean_name(update.message.from_user.last_name) or ""
         entered_password = update.message.text
         
-        config = load_bot_config()
-        correct_password = config.get('password', '')
-        print(f'Password is :{correct_password}')
+        correct_password = get_telegram_config().get('password', '')
         
         if entered_password == correct_password:
-            chat_ids = load_chat_ids()
-            
             # Check if user already exists
-            if not any(user['chat_id'] == chat_id for user in chat_ids):
+            if not get_subscriber_store().contains(chat_id):
                 save_new_user(chat_id, username, first_name,last_name)
                 welcome_message = (
                     f"🎉 Welcome {first_name} {last_name}!\n\n"
@@ -139,11 +108,7 @@ async def check_password(update: Update, context: CallbackContext) -> int:
 
 def remove_user(chat_id):
    try:
-       chat_ids = load_chat_ids()
-       chat_ids = [user for user in chat_ids if user['chat_id'] != chat_id]
-       with open(CHAT_IDS_FILE, 'w') as f:
-           json.dump(chat_ids, f, indent=4)
-       return True
+       return get_subscriber_store().remove(chat_id)
    except Exception as e:
        logger.error(f"Error removing user: {e}")
        return False
@@ -156,9 +121,8 @@ async def end(update: Update, context: CallbackContext) -> None:
        last_name = clean_name(update.message.from_user.last_name) or ""
 
        
-       chat_ids = load_chat_ids()
        # Check if user exists in chat_ids
-       if any(user['chat_id'] == chat_id for user in chat_ids):
+       if get_subscriber_store().contains(chat_id):
            remove_user(chat_id)
            goodbye_message = (
                f"👋 Goodbye {first_name} {last_name}!\n\n"
@@ -181,30 +145,83 @@ async def end(update: Update, context: CallbackContext) -> None:
 async def error_handler(update: Update, context: CallbackContext) -> None:
     logger.error(f"Update {update} caused error {context.error}")
 
-# Main Function
-async def run_bot():
+# Bot loop and its stop event, so config changes and shutdown can reach polling from other threads
+_bot_loop = None
+_stop_event = None
+_restart_requested = False
+
+def _request_stop():
+    if _bot_loop is not None and _stop_event is not None:
+        _bot_loop.call_soon_threadsafe(_stop_event.set)
+
+def _on_config_change(old_config, new_config):
+    """Restart polling when the bot token changes"""
+    global _restart_requested
+    if old_config.get('bot_token') == new_config.get('bot_token'):
+        return
+    logger.info("Bot token changed, restarting bot")
+    _restart_requested = True
+    _request_stop()
+
+async def cleanup():
+    """Stop polling so the bot thread can exit"""
+    global _restart_requested
+    _restart_requested = False
+    _request_stop()
+
+async def poll(app):
+    """Poll for updates on the running loop until a stop is requested.
+
+    Uses the async lifecycle instead of run_polling, which starts its own
+    event loop and installs signal handlers, neither of which works inside
+    run_bot on the bot thread.
+    """
+    await app.initialize()
     try:
-        bot_config = load_bot_config()
-        bot_token = bot_config.get('bot_token', '')
-
-        app = ApplicationBuilder().token(bot_token).build()
-        app.add_handler(ConversationHandler(
-            entry_points=[CommandHandler("start", start)],
-            states={PASSWORD_CHECK: [MessageHandler(filters.TEXT & ~filters.COMMAND, check_password)]},
-            fallbacks=[CommandHandler("end", end)]
-        ))
-        app.add_handler(CommandHandler("end", end))
-        app.add_error_handler(error_handler)
-
-        await app.bot.delete_webhook(drop_pending_updates=True)
+        await app.start()
+        await app.updater.start_polling(drop_pending_updates=True)
         logger.info("Bot started successfully.")
-        await app.run_polling()
-    except ConnectTimeout:
-        logger.error("Connection timed out. Retrying...")
-        await asyncio.sleep(5)
-        await run_bot()
-    except Exception as e:
-        logger.error(f"Critical error in bot: {e}")
+        await _stop_event.wait()
+        await app.updater.stop()
+        await app.stop()
+    finally:
+        await app.shutdown()
+
+# Main Function
+async def run_bot():
+    global _bot_loop, _stop_event, _restart_requested
+    config = get_telegram_config()
+    config.subscribe(_on_config_change)
+    config.start()
+    _bot_loop = asyncio.get_running_loop()
+    while True:
+        _restart_requested = False
+        _stop_event = asyncio.Event()
+        try:
+            bot_token = config.get('bot_token', '')
+
+            builder = ApplicationBuilder().token(bot_token)
+            api_base = (config.get('api_base') or '').rstrip('/')
+            if api_base:
+                builder = builder.base_url(f"{api_base}/bot").base_file_url(f"{api_base}/file/bot")
+            app = builder.build()
+            app.add_handler(ConversationHandler(
+                entry_points=[CommandHandler("start", start)],
+                states={PASSWORD_CHECK: [MessageHandler(filters.TEXT & ~filters.COMMAND, check_password)]},
+                fallbacks=[CommandHandler("end", end)]
+            ))
+            app.add_handler(CommandHandler("end", end))
+            app.add_error_handler(error_handler)
+
+            await poll(app)
+        except ConnectTimeout:
+            logger.error("Connection timed out. Retrying...")
+            await asyncio.sleep(5)
+            _restart_requested = True
+        except Exception as e:
+            logger.error(f"Critical error in bot: {e}")
+        if not _restart_requested:
+            break
 
 if __name__ == "__main__":
     try:
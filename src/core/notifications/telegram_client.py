@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class TelegramClient:
+    """Bot API client sharing one pooled keep-alive HTTP session.
+
+    The httpx session lives on a private event loop in a daemon thread, so
+    callers on any thread or event loop (asyncio.run in a worker, the bot
+    loop, ...) reuse the same warm connections instead of opening a new
+    TCP+TLS connection per message.
+    """
+
+    API_BASE = "https://api.telegram.org"
+
+    def __init__(self, token, max_connections=50, timeout=15, api_base=None):
+        self.token = token
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.api_base = (api_base or self.API_BASE).rstrip('/')
+        self._loop = None
+        self._client = None
+        self._thread = None
+        self._started = threading.Event()
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run_loop, name="telegram-client", daemon=True)
+                self._thread.start()
+        self._started.wait()
+
+    def _run_loop(self):
+        # httpx is only needed once the first message goes out
+        import httpx
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=60
+            )
+        )
+        self._started.set()
+        self._loop.run_forever()
+
+    async def run(self, coro):
+        """Await a coroutine on the client loop from whatever loop the caller is on"""
+        self._ensure_started()
+        try:
+            if asyncio.get_running_loop() is self._loop:
+                return await coro
+        except RuntimeError:
+            pass
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    def configure(self, token, api_base=None):
+        """Switch to a new bot token or Bot API base; pooled connections are kept"""
+        self.token = token
+        self.api_base = (api_base or self.API_BASE).rstrip('/')
+
+    async def _post(self, method, payload):
+        url = f"{self.api_base}/bot{self.token}/{method}"
+        response = await self._client.post(url, json=payload)
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        return response.status_code, body
+
+    async def _send_message(self, chat_id, text, parse_mode):
+        payload = {"chat_id": chat_id, "text": text, "parse_mode": parse_mode}
+        try:
+            status_code, body = await self._post("sendMessage", payload)
+            if status_code == 200:
+                return {"chat_id": chat_id, "success": True,
+                        "message_id": body.get("result", {}).get("message_id")}
+            return {
+                "chat_id": chat_id,
+                "success": False,
+                "status_code": status_code,
+                "retry_after": body.get("parameters", {}).get("retry_after"),
+                "error": body.get("description", "Unknown error"),
+            }
+        except Exception as e:
+            return {"chat_id": chat_id, "success": False, "status_code": None, "error": str(e)}
+
+    async def send_message(self, chat_id, text, parse_mode="Markdown"):
+        """Send one message and return a result dict (never raises)"""
+        return await self.run(self._send_message(chat_id, text, parse_mode))
+
+    def close(self):
+        """Close pooled connections and stop the client loop"""
+        if not self._loop:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop)
+        try:
+            future.result(timeout=5)
+        except Exception as e:
+            logger.error(f"Error closing Telegram client: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client(token, api_base=None, **kwargs):
+    """Return the process-wide client, creating it on first use.
+
+    A token or api_base that differs from the client's (telegram_config.json
+    was edited) reconfigures it in place, so callers holding the client and
+    the dispatcher keyed on it keep working.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = TelegramClient(token, api_base=api_base, **kwargs)
+        elif _client.token != token or _client.api_base != (api_base or TelegramClient.API_BASE).rstrip('/'):
+            logger.info("Telegram config changed, reconfiguring client")
+            _client.configure(token, api_base)
+        return _client
+
+
+def close_client():
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
@@ -0,0 +1,247 @@
+import logging
+import queue
+import time
+from collections import deque
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QListView
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel, QTimer
+from PyQt6.QtGui import QBrush, QColor
+
+# Message type -> (logging level, icon, color)
+MESSAGE_TYPES = {
+    "error": (logging.ERROR, "⚠", "#BF616A"),
+    "warning": (logging.WARNING, "⚠", "#EBCB8B"),
+    "success": (logging.INFO, "✓", "#A3BE8C"),
+    "info": (logging.INFO, "ℹ", "#D8DEE9"),
+}
+LEVEL_FILTERS = [("All", logging.DEBUG), ("Info", logging.INFO), ("Warnings", logging.WARNING),
+                 ("Errors", logging.ERROR)]
+
+LevelRole = Qt.ItemDataRole.UserRole
+
+
+class LogEntry:
+    __slots__ = ('text', 'level', 'message_type', 'expires_at')
+
+    def __init__(self, text, level, message_type, expires_at):
+        self.text = text
+        self.level = level
+        self.message_type = message_type
+        self.expires_at = expires_at
+
+
+class LogListModel(QAbstractListModel):
+    """Bounded, newest-first ring buffer of log lines.
+
+    Adding a line is one row insert; once max_entries is reached the oldest
+    line is dropped with it. Expired lines are removed by sweep() in
+    contiguous row ranges, so the view keeps its scroll position and no
+    document is ever rebuilt.
+    """
+
+    def __init__(self, max_entries=500, parent=None):
+        super().__init__(parent)
+        self.max_entries = max_entries
+        self._entries = deque()
+        self._brushes = {name: QBrush(QColor(color)) for name, (_, _, color) in MESSAGE_TYPES.items()}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return entry.text
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self._brushes.get(entry.message_type)
+        if role == LevelRole:
+            return entry.level
+        return None
+
+    def add(self, text, message_type="info", duration=5000, level=None):
+        """Insert a line at the top; duration is in milliseconds, None keeps it until pushed out"""
+        self.add_many([(text, message_type, duration, level)])
+
+    def add_many(self, lines):
+        """Insert (text, message_type, duration, level) lines, oldest first, with one row insert"""
+        lines = lines[-self.max_entries:]
+        if not lines:
+            return
+        now = time.monotonic()
+        entries = []
+        for text, message_type, duration, level in lines:
+            default_level, icon, _ = MESSAGE_TYPES.get(message_type, MESSAGE_TYPES["info"])
+            expires_at = now + duration / 1000 if duration else None
+            entries.append(LogEntry(f"{icon} {text}", level or default_level, message_type, expires_at))
+
+        overflow = len(self._entries) + len(entries) - self.max_entries
+        if overflow > 0:
+            last = len(self._entries) - 1
+            self.beginRemoveRows(QModelIndex(), last - overflow + 1, last)
+            for _ in range(overflow):
+                self._entries.pop()
+            self.endRemoveRows()
+        self.beginInsertRows(QModelIndex(), 0, len(entries) - 1)
+        # extendleft reverses, so the newest line ends up on top
+        self._entries.extendleft(entries)
+        self.endInsertRows()
+
+    def sweep(self):
+        """Drop expired lines; returns how many were removed"""
+        now = time.monotonic()
+        expired = [row for row, entry in enumerate(self._entries)
+                   if entry.expires_at is not None and entry.expires_at <= now]
+        if not expired:
+            return 0
+        # Bottom-up runs of adjacent rows, one removal each
+        runs = []
+        for row in reversed(expired):
+            if runs and runs[-1][0] == row + 1:
+                runs[-1][0] = row
+            else:
+                runs.append([row, row])
+        for first, last in runs:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for _ in range(last - first + 1):
+                del self._entries[first]
+            self.endRemoveRows()
+        return len(expired)
+
+    def clear(self):
+        self.beginResetModel()
+        self._entries.clear()
+        self.endResetModel()
+
+
+class LevelFilterProxy(QSortFilterProxyModel):
+    """Hides lines below the selected logging level"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.min_level = logging.INFO
+
+    def set_min_level(self, level):
+        self.min_level = level
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        return (index.data(LevelRole) or logging.INFO) >= self.min_level
+
+
+class QueueLogHandler(logging.Handler):
+    """logging handler that only queues records; the panel formats them on the GUI thread"""
+
+    def __init__(self, level=logging.INFO):
+        super().__init__(level)
+        self.records = queue.SimpleQueue()
+
+    def emit(self, record):
+        self.records.put(record)
+
+
+class LogPanel(QWidget):
+    """Log area of the main window: temporary messages plus Python logging output"""
+
+    SWEEP_INTERVAL_MS = 500
+    DRAIN_INTERVAL_MS = 100
+    # Records taken off the queue per tick; only the newest max_entries are shown
+    DRAIN_LIMIT = 5000
+    # How long lines that came from logging stay visible
+    RECORD_DURATION_MS = 30000
+
+    def __init__(self, max_entries=500, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self.model = LogListModel(max_entries, self)
+        self.proxy = LevelFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.handler = QueueLogHandler()
+        self.handler.setFormatter(logging.Formatter('%(name)s: %(message)s'))
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Log level:"))
+        self.level_filter = QComboBox()
+        for name, level in LEVEL_FILTERS:
+            self.level_filter.addItem(name, level)
+        self.level_filter.setCurrentIndex(1)
+        self.level_filter.currentIndexChanged.connect(
+            lambda index: self.proxy.set_min_level(self.level_filter.itemData(index))
+        )
+        filter_layout.addWidget(self.level_filter)
+        filter_layout.addStretch()
+        layout.addLayout(filter_layout)
+
+        self.view = QListView()
+        self.view.setModel(self.proxy)
+        self.view.setUniformItemSizes(True)
+        self.view.setWordWrap(False)
+        self.view.setMaximumHeight(150)
+        self.view.setStyleSheet("""
+            QListView {
+                background-color: #2E3440;
+                color: #D8DEE9;
+                border: 1px solid #4C566A;
+                font-family: monospace;
+                font-size: 12px;
+                padding: 5px;
+            }
+            QScrollBar:vertical {
+                background-color: #2E3440;
+                width: 12px;
+            }
+            QScrollBar::handle:vertical {
+                background-color: #4C566A;
+                border-radius: 6px;
+                min-height: 20px;
+            }
+            QScrollBar::handle:vertical:hover {
+                background-color: #5E81AC;
+            }
+        """)
+        layout.addWidget(self.view)
+
+        self.sweep_timer = QTimer(self)
+        self.sweep_timer.timeout.connect(self.model.sweep)
+        self.sweep_timer.start(self.SWEEP_INTERVAL_MS)
+        self.drain_timer = QTimer(self)
+        self.drain_timer.timeout.connect(self.drain_records)
+        self.drain_timer.start(self.DRAIN_INTERVAL_MS)
+
+    def add_message(self, message, message_type="info", duration=5000):
+        self.model.add(message, message_type, duration)
+
+    def attach_logging(self, logger=None, level=logging.INFO):
+        """Mirror records of logger (the root logger by default) into the panel"""
+        self.handler.setLevel(level)
+        (logger or logging.getLogger()).addHandler(self.handler)
+
+    def detach_logging(self, logger=None):
+        (logger or logging.getLogger()).removeHandler(self.handler)
+
+    def drain_records(self):
+        """Move queued logging records into the panel in one insert"""
+        records = []
+        for _ in range(self.DRAIN_LIMIT):
+            try:
+                records.append(self.handler.records.get_nowait())
+            except queue.Empty:
+                break
+        # Older records of a burst would be pushed out of the ring straight away
+        lines = []
+        for record in records[-self.model.max_entries:]:
+            try:
+                text = self.handler.format(record)
+            except Exception as e:
+                text = f"Unformattable log record: {e}"
+            if record.levelno >= logging.ERROR:
+                message_type = "error"
+            elif record.levelno >= logging.WARNING:
+                message_type = "warning"
+            else:
+                message_type = "info"
+            lines.append((text, message_type, self.RECORD_DURATION_MS, record.levelno))
+        self.model.add_many(lines)
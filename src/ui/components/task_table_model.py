@@ -0,0 +1,257 @@
+from datetime import datetime
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QBrush, QColor, QFont
+
+
+class TaskRow:
+    """Compact per-task record backing one table row"""
+
+    __slots__ = ('task_id', 'product_name', 'price', 'launch_time', 'quantity', 'monitoring_status',
+                 'product_status', 'cart_status', 'checkout_status', 'notification_status', 'interval', 'url')
+
+    def __init__(self, task_id, url="", interval=0, product_name="", monitoring_status="",
+                 product_status="", notification_status="", launch_time=""):
+        self.task_id = task_id
+        self.product_name = product_name
+        self.price = ""
+        self.launch_time = launch_time
+        self.quantity = ""
+        self.monitoring_status = monitoring_status
+        self.product_status = product_status
+        self.cart_status = ""
+        self.checkout_status = ""
+        self.notification_status = notification_status
+        self.interval = interval
+        self.url = url
+
+
+# (header, TaskRow field); the Action column has no field and is drawn by StopButtonDelegate
+COLUMNS = [
+    ("Product Name", 'product_name'),
+    ("Price", 'price'),
+    ("Launch Time", 'launch_time'),
+    ("Quantity", 'quantity'),
+    ("Monitoring", 'monitoring_status'),
+    ("Product", 'product_status'),
+    ("Cart", 'cart_status'),
+    ("Check Out", 'checkout_status'),
+    ("Notification", 'notification_status'),
+    ("Action", None),
+    ("Interval", 'interval'),
+    ("URL", 'url'),
+]
+FIELD_COLUMNS = {field: column for column, (_, field) in enumerate(COLUMNS) if field}
+ACTION_COLUMN = 9
+
+# Status text -> (background, foreground) per column
+STATUS_COLORS = {
+    'monitoring_status': {
+        "Active": ("#A3BE8C", "#000000"),
+        "Completed": ("#88C0D0", "#000000"),
+        "Stopped": ("#BF616A", "#FFFFFF"),
+        "Error": ("#B48EAD", "#FFFFFF"),
+    },
+    'product_status': {
+        "Available": ("#A3BE8C", "#000000"),
+        "Unavailable": ("#BF616A", "#FFFFFF"),
+        "Unknown": ("#BF616A", "#FFFFFF"),
+        "Searching": ("#EBCB8B", "#000000"),
+    },
+    'notification_status': {
+        "Sent": ("#A3BE8C", "#000000"),
+        "Pending": ("#EBCB8B", "#000000"),
+        "Cancelled": ("#BF616A", "#FFFFFF"),
+    },
+}
+# Columns always drawn green and bold
+HIGHLIGHT_FIELDS = {'interval', 'url'}
+HIGHLIGHT_COLORS = ("#A3BE8C", "#000000")
+FINISHED_STATUSES = {"Completed", "Stopped", "Error"}
+
+TaskIdRole = Qt.ItemDataRole.UserRole
+StopEnabledRole = Qt.ItemDataRole.UserRole + 1
+
+
+def format_launch_time(launch_time):
+    """Launch Time column text for a datetime, epoch seconds or None"""
+    if not launch_time:
+        return ""
+    if not isinstance(launch_time, datetime):
+        launch_time = datetime.fromtimestamp(float(launch_time))
+    return launch_time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+class TaskTableModel(QAbstractTableModel):
+    """Monitoring tasks as a table model.
+
+    Each row is a TaskRow; brushes and fonts are built once and shared by
+    every cell, and an update emits dataChanged for the one cell it touched
+    instead of replacing items. Rows are indexed by task id and bucketed by
+    monitoring status, so lookups and "all stopped tasks" never scan the
+    table, and bulk removal is one range removal per contiguous run of rows
+    (or one model reset when the rows are scattered).
+    """
+
+    # More separate runs than this are removed with a single model reset
+    MAX_REMOVE_RUNS = 16
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._row_index = {}
+        self._status_buckets = {}
+        self._brushes = {
+            field: {text: (QBrush(QColor(bg)), QBrush(QColor(fg))) for text, (bg, fg) in colors.items()}
+            for field, colors in STATUS_COLORS.items()
+        }
+        self._highlight = (QBrush(QColor(HIGHLIGHT_COLORS[0])), QBrush(QColor(HIGHLIGHT_COLORS[1])))
+        self._bold = QFont()
+        self._bold.setBold(True)
+        self._center = Qt.AlignmentFlag.AlignCenter
+
+    # ---- Qt model interface ----------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section][0]
+        return None
+
+    def flags(self, index):
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        if role == TaskIdRole:
+            return row.task_id
+        if column == ACTION_COLUMN:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return "Stop"
+            if role == StopEnabledRole:
+                return row.monitoring_status not in FINISHED_STATUSES
+            return None
+
+        field = COLUMNS[column][1]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return getattr(row, field)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return None if field == 'product_name' else self._center
+        if role in (Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ForegroundRole):
+            if field in HIGHLIGHT_FIELDS:
+                brushes = self._highlight
+            else:
+                brushes = self._brushes.get(field, {}).get(getattr(row, field))
+            if brushes:
+                return brushes[0] if role == Qt.ItemDataRole.BackgroundRole else brushes[1]
+            return None
+        if role == Qt.ItemDataRole.FontRole and field in HIGHLIGHT_FIELDS:
+            return self._bold
+        return None
+
+    # ---- task API --------------------------------------------------------
+
+    def row_of(self, task_id):
+        return self._row_index.get(task_id)
+
+    def task_id_at(self, row):
+        return self._rows[row].task_id
+
+    def record(self, task_id):
+        row = self._row_index.get(task_id)
+        return None if row is None else self._rows[row]
+
+    def task_ids(self):
+        return [row.task_id for row in self._rows]
+
+    def task_ids_with_status(self, monitoring_status):
+        """Task ids whose monitoring status is monitoring_status, without scanning rows"""
+        return set(self._status_buckets.get(monitoring_status, ()))
+
+    def _bucket_add(self, record):
+        self._status_buckets.setdefault(record.monitoring_status, set()).add(record.task_id)
+
+    def _bucket_discard(self, record):
+        bucket = self._status_buckets.get(record.monitoring_status)
+        if bucket is not None:
+            bucket.discard(record.task_id)
+            if not bucket:
+                del self._status_buckets[record.monitoring_status]
+
+    def add_task(self, record):
+        """Append a row for a new task"""
+        position = len(self._rows)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._rows.append(record)
+        self._row_index[record.task_id] = position
+        self._bucket_add(record)
+        self.endInsertRows()
+        return position
+
+    def set_field(self, task_id, field, value):
+        """Update one field; returns True if the cell changed"""
+        row = self._row_index.get(task_id)
+        if row is None:
+            return False
+        record = self._rows[row]
+        if getattr(record, field) == value:
+            return False
+        if field == 'monitoring_status':
+            self._bucket_discard(record)
+            record.monitoring_status = value
+            self._bucket_add(record)
+        else:
+            setattr(record, field, value)
+        index = self.index(row, FIELD_COLUMNS[field])
+        self.dataChanged.emit(index, index)
+        if field == 'monitoring_status':
+            # The Stop button is enabled by the monitoring status
+            action = self.index(row, ACTION_COLUMN)
+            self.dataChanged.emit(action, action)
+        return True
+
+    def remove_tasks(self, task_ids):
+        """Remove the rows of the given tasks in as few model operations as possible"""
+        rows = sorted(self._row_index[task_id] for task_id in set(task_ids) if task_id in self._row_index)
+        if not rows:
+            return 0
+
+        # Group into contiguous runs: [(first, last), ...]
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+
+        removed = set(rows)
+        for row in rows:
+            record = self._rows[row]
+            self._bucket_discard(record)
+            del self._row_index[record.task_id]
+
+        if len(runs) > self.MAX_REMOVE_RUNS:
+            self.beginResetModel()
+            self._rows = [record for row, record in enumerate(self._rows) if row not in removed]
+            self._reindex()
+            self.endResetModel()
+        else:
+            # Bottom-up so earlier runs keep their row numbers
+            for first, last in reversed(runs):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                del self._rows[first:last + 1]
+                self.endRemoveRows()
+            self._reindex(runs[0][0])
+        return len(rows)
+
+    def _reindex(self, start=0):
+        """Refresh row numbers from start; rows above it did not move"""
+        for row in range(start, len(self._rows)):
+            self._row_index[self._rows[row].task_id] = row
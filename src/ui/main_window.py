@@ -2,41 +2,56 @@
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QSpinBox, QTextEdit,
-    QMessageBox, QDialog,QScrollArea,QPlainTextEdit,QTextBrowser
+    QMessageBox, QDialog,QScrollArea,QPlainTextEdit,QTextBrowser,
+    QCheckBox, QDateTimeEdit, QProgressBar
 )
 import asyncio
 from PyQt6.QtGui import QRegularExpressionValidator
 from PyQt6.QtCore import QRegularExpression
 from datetime import datetime
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import QTimer, QDateTime, pyqtSignal
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 import logging
 import json
-from PyQt6.QtGui import QTextCursor  # Add this import at the top
 
 '''File/functions Import'''
 from src.core.managers.json_file_handler import get_json_path
-from src.core.managers.persistence_manager import PersistenceManager
+from src.core.managers.persistence_manager import MonitoringTask
+from src.core.monitor_runtime import MonitorRuntime
 from src.core.product_monitor import ProductMonitorWorker
-from src.core.notifications import telegram_bot
+from src.core.notifications.subscriber_store import get_subscriber_store
+from src.core.managers.config_service import get_telegram_config
 from src.ui.components.table_widget import TableWidget
+from src.ui.components.log_panel import LogPanel
 
 
 
 class MainWindow(QMainWindow):
+    # (task_id, error) from the scheduler thread once a restored task's session is open
+    restored_task_ready = pyqtSignal(str, str)
+
     def __init__(self, driver_path, table_widget):
         super().__init__()
         self.driver_path = driver_path
+        # Pool, scheduler and journal shared with headless mode
+        self.runtime = MonitorRuntime(driver_path)
+        self.runtime.start()
+        self.persistence_manager = self.runtime.persistence_manager
         # self.table_widget = table_widget
         self.table_widget = TableWidget()
-        self.persistence_manager = PersistenceManager()
+        self.shutting_down = False
         self.table_widget.stop_task_signal.connect(self.handle_stop_task)
         self.active_monitors = {}  # Dictionary to store active monitoring workers
         self.logger = logging.getLogger(__name__)
         self.file_path = get_json_path('Actived_tasks.json')
         self.url_validator = None
         self.bot_thread = None
+        self.restore_queue = []
+        self.restore_total = 0
+        self.restore_settled = 0
+        self.restore_failed = 0
+        self.restored_task_ready.connect(self.on_restored_task_ready)
         self.setup_ui()
         self.restore_active_monitors()
 
@@ -53,7 +68,7 @@ class MainWindow(QMainWindow):
                 font-size: 14px;
                 color: #ECEFF4;
             }
-            QLineEdit, QSpinBox, QTextEdit {
+            QLineEdit, QSpinBox, QTextEdit, QDateTimeEdit {
                 background-color: #3B4252;
                 border: 1px solid #4C566A;
                 color: #ECEFF4;
@@ -61,6 +76,10 @@ class MainWindow(QMainWindow):
                 border-radius: 4px;
                 font-size: 13px;
             }
+            QCheckBox {
+                font-size: 14px;
+                color: #ECEFF4;
+            }
             QPushButton {
                 background-color: #5E81AC;
                 color: #ECEFF4;
@@ -106,6 +125,19 @@ class MainWindow(QMainWindow):
         interval_layout.addWidget(self.interval_input)
         input_section.addLayout(interval_layout)
 
+        # Launch time input (optional precision mode around a drop)
+        launch_layout = QHBoxLayout()
+        self.launch_checkbox = QCheckBox("Launch Time:")
+        self.launch_checkbox.setMinimumWidth(120)
+        self.launch_input = QDateTimeEdit(QDateTime.currentDateTime().addSecs(3600))
+        self.launch_input.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+        self.launch_input.setCalendarPopup(True)
+        self.launch_input.setEnabled(False)
+        self.launch_checkbox.toggled.connect(self.launch_input.setEnabled)
+        launch_layout.addWidget(self.launch_checkbox)
+        launch_layout.addWidget(self.launch_input)
+        input_section.addLayout(launch_layout)
+
         layout.addLayout(input_section)
 
         # Button section
@@ -121,6 +153,12 @@ class MainWindow(QMainWindow):
         button_layout.addWidget(self.telegram_button)
         layout.addLayout(button_layout)
 
+        # Restore progress, only shown while saved tasks come back up
+        self.restore_progress = QProgressBar()
+        self.restore_progress.setFormat("Restoring tasks: %v/%m live")
+        self.restore_progress.setVisible(False)
+        layout.addWidget(self.restore_progress)
+
         # Button Connections
         self.start_button.clicked.connect(self.start_monitoring_task)
         # self.start_button.clicked.connect(self.start_monitoring)
@@ -131,34 +169,10 @@ class MainWindow(QMainWindow):
         # Add table widget
         layout.addWidget(self.table_widget)
 
-        # Create log display
-        self.log_display = QTextEdit()
-        self.log_display.setReadOnly(True)
-        self.log_display.setMaximumHeight(150)
-        self.log_display.setStyleSheet("""
-            QTextEdit {
-                background-color: #2E3440;
-                color: #D8DEE9;
-                border: 1px solid #4C566A;
-                font-family: monospace;
-                font-size: 12px;
-                padding: 5px;
-            }
-            QScrollBar:vertical {
-                background-color: #2E3440;
-                width: 12px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #4C566A;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #5E81AC;
-            }
-        """)
-        self.log_display.setAcceptRichText(True)
-        layout.addWidget(self.log_display)
+        # Log panel: temporary messages plus application logging, filterable by level
+        self.log_panel = LogPanel()
+        self.log_panel.attach_logging()
+        layout.addWidget(self.log_panel)
     def show_telegram_menu(self):
         dialog = QDialog(self)
         dialog.setWindowTitle("Telegram Bot Menu")
@@ -298,16 +312,8 @@ class MainWindow(QMainWindow):
             # If user confirms, update the password
             if response == "Yes":
                 try:
-                    # Read the current data
-                    with open(get_json_path('telegram_config.json'), 'r') as file:
-                        data = json.load(file)
-                    
-                    # Update the password
-                    data['password'] = new_password
-                    
-                    # Write the updated data back to file
-                    with open(get_json_path('telegram_config.json'), 'w') as file:
-                        json.dump(data, file, indent=4)
+                    # Update the password; the running bot picks it up immediately
+                    get_telegram_config().update(password=new_password)
                     
                     # Show success message using custom message box
                     self.show_custom_message_box(
@@ -390,14 +396,8 @@ class MainWindow(QMainWindow):
         
         if result == "Yes":
             try:
-                with open(get_json_path('chat_ids.json'), 'r') as file:
-                    users = json.load(file)
-                    
-                users = [user for user in users if str(user['chat_id']) != str(chat_id)]
-                
-                with open(get_json_path('chat_ids.json'), 'w') as file:
-                    json.dump(users, file, indent=4)
-                
+                get_subscriber_store().remove(chat_id.strip())
+
                 show_custom_message_box(self, "Success", "User removed successfully", ["OK"])
                 parent_dialog.close()
                 
@@ -493,7 +493,7 @@ class MainWindow(QMainWindow):
             
             if result == "Yes": 
                 self.save_telegram_config(bot_name, token, password) 
-                open(get_json_path('chat_ids.json'), 'w').close() 
+                get_subscriber_store().clear()
                 self.show_custom_message_box("Success", "New Telegram bot configurated successfully.\n\n Please add new user and restart app", ["OK"]) 
                 dialog.close() 
 
@@ -595,9 +595,10 @@ class MainWindow(QMainWindow):
         scroll_layout = QVBoxLayout(scroll_content)
 
         try:
-            with open(get_json_path('chat_ids.json'), 'r') as file:
-                users = json.load(file)
-                
+            users = get_subscriber_store().all()
+            if not users:
+                scroll_layout.addWidget(QLabel("No users found"))
+
             for user in users:
                 user_info_text = (
                     f"Name: {user.get('first_name', '')} {user.get('last_name', '')}\n"
@@ -609,10 +610,8 @@ class MainWindow(QMainWindow):
                 user_info.setReadOnly(True)
                 scroll_layout.addWidget(user_info)
                 
-        except FileNotFoundError:
-            error_label = QLabel("No users found")
-            scroll_layout.addWidget(error_label)
-        except json.JSONDecodeError:
+        except Exception as e:
+            self.logger.error(f"Error loading users: {e}")
             error_label = QLabel("No users found")
             scroll_layout.addWidget(error_label)
 
@@ -623,14 +622,12 @@ class MainWindow(QMainWindow):
         layout.addWidget(scroll)
         dialog.exec()
     def show_forgot_password(self):
-        try:
-            with open(get_json_path('telegram_config.json'), 'r') as f:
-                config = json.load(f)
-                bot_name = config.get('bot_name', '')
-                bot_password = config.get('password', '')
-                bot_token = config.get('bot_token', '')
-        except FileNotFoundError:
+        config = get_telegram_config().snapshot()
+        if not config:
             return
+        bot_name = config.get('bot_name', '')
+        bot_password = config.get('password', '')
+        bot_token = config.get('bot_token', '')
 
         dialog = QDialog(self)
         dialog.setWindowTitle("Telegram Bot Details")
@@ -661,63 +658,32 @@ class MainWindow(QMainWindow):
 
         dialog.exec()
 
-    def save_telegram_config(self, name, token, password, filename=get_json_path('telegram_config.json')):
-        config = {"bot_name": name, "bot_token": token, "password": password}
-        with open(filename, "w") as f:
-            json.dump(config, f)
+    def save_telegram_config(self, name, token, password):
+        get_telegram_config().update(bot_name=name, bot_token=token, password=password)
     def show_temporary_log(self, message, duration=5000, message_type=None):
         """Show a styled log message that disappears after specified duration"""
         try:
-            # Get icon based on message type
-            if message_type == "error":
-                icon = "⚠"
-            elif message_type == "success":
-                icon = "✓"
-            else:  # info
-                icon = "ℹ"
-
-            # Create message with icon
-            full_message = f"{icon} {message}\n"
-
-            # Insert at the beginning of text
-            cursor = self.log_display.textCursor()
-            cursor.movePosition(QTextCursor.MoveOperation.Start)
-            cursor.insertText(full_message)
-
-            # Schedule message removal
-            QTimer.singleShot(
-                duration, lambda: self.remove_single_message(full_message))
-
+            self.log_panel.add_message(message, message_type or "info", duration)
         except Exception as e:
             print(f"Error showing temporary log: {e}")
 
-    def remove_single_message(self, message_to_remove):
-        """Remove a specific message from the log display"""
-        try:
-            current_text = self.log_display.toPlainText()
-            new_text = current_text.replace(message_to_remove, '')
-            self.log_display.setPlainText(new_text)
-        except Exception as e:
-            print(f"Error removing message: {e}")
-
     def restore_active_monitors(self):
-        """Restore previously active monitoring tasks"""
+        """Restore previously active monitoring tasks without blocking the GUI"""
         try:
-            active_tasks = self.persistence_manager.load_active_tasks()
-            num_tasks = len(active_tasks)
-
-            # Restore each task
-            for task in active_tasks:
-                self.start_monitoring_task(task)
-
-            # Log message with number of tasks restored
-            if num_tasks > 0:
-                self.show_temporary_log(
-                    f"Successfully restored {num_tasks} previous monitoring task{'s' if num_tasks > 1 else ''}.", message_type="success"
-                )
-            else:
+            active_tasks = self.runtime.load_restorable()
+            if not active_tasks:
                 self.show_temporary_log(
                     "No previous monitoring tasks to restore.", message_type="info")
+                return
+
+            self.restore_queue = list(active_tasks)
+            self.restore_total = len(active_tasks)
+            self.restore_settled = 0
+            self.restore_failed = 0
+            self.restore_progress.setRange(0, self.restore_total)
+            self.restore_progress.setValue(0)
+            self.restore_progress.setVisible(True)
+            QTimer.singleShot(0, self.restore_next_batch)
 
         except Exception as e:
             self.logger.error(f"Error restoring monitors: {e}")
@@ -725,6 +691,39 @@ class MainWindow(QMainWindow):
             #     "Error restoring previous monitoring tasks"
             # )
 
+    def restore_next_batch(self):
+        """Create a few restored tasks per event-loop turn, staggering their first checks"""
+        started = self.restore_total - len(self.restore_queue)
+        batch_size = self.runtime.RESTORE_BATCH
+        batch, self.restore_queue = self.restore_queue[:batch_size], self.restore_queue[batch_size:]
+        for offset, task in enumerate(batch):
+            monitor_id = self.start_monitoring_task(
+                task,
+                start_delay=self.runtime.restore_delay(started + offset),
+                on_ready=lambda task_id, error: self.restored_task_ready.emit(task_id, str(error or ""))
+            )
+            if monitor_id is None:
+                self.on_restored_task_ready(task.task_id or "", "Failed to start")
+        if self.restore_queue:
+            QTimer.singleShot(0, self.restore_next_batch)
+
+    def on_restored_task_ready(self, task_id, error):
+        """Advance the restore progress bar as restored sessions come up"""
+        self.restore_settled += 1
+        if error:
+            self.restore_failed += 1
+            self.logger.error(f"Restored task {task_id} failed to start: {error}")
+        self.restore_progress.setValue(self.restore_settled)
+        if self.restore_settled < self.restore_total:
+            return
+
+        self.restore_progress.setVisible(False)
+        restored = self.restore_total - self.restore_failed
+        message = f"Successfully restored {restored} previous monitoring task{'s' if restored != 1 else ''}."
+        if self.restore_failed:
+            message += f" {self.restore_failed} failed to start."
+        self.show_temporary_log(message, message_type="error" if self.restore_failed else "success")
+
     def validate_and_start_monitoring(self):
         """Validate inputs and call start_monitoring_task with validated values"""
         try:
@@ -805,71 +804,57 @@ class MainWindow(QMainWindow):
         self.url_validator = QRegularExpressionValidator(regex)
         self.url_input.setValidator(self.url_validator)
 
-    def start_monitoring_task(self, task=None):
-        """Start a new monitoring task"""
+    def start_monitoring_task(self, task=None, start_delay=0, on_ready=None):
+        """Start a new monitoring task, or a restored one when task is given"""
         try:
-            # if task is None:
-            #     # New monitoring task
-            #     url = self.url_input.text().strip()
-            #     interval = self.interval_input.value()
-            # else:
-            #     # Restored task
-            #     url = task.url
-            #     interval = task.interval
-            # New monitoring task
-            url = self.url_input.text().strip()
-            interval = self.interval_input.value()
-            monitor = ProductMonitorWorker(
-                driver_path=self.driver_path,
-                table_widget=self.table_widget,
-                persistence_manager=self.persistence_manager,
-                url=url,
-                check_interval=interval
-            )
+            # The Start button passes its checked flag here
+            if not isinstance(task, MonitoringTask):
+                # New monitoring task
+                url = self.url_input.text().strip()
+                interval = self.interval_input.value()
+                launch_time = None
+                if self.launch_checkbox.isChecked():
+                    launch_time = self.launch_input.dateTime().toPyDateTime()
+                task = MonitoringTask(url=url, interval=interval, launch_time=launch_time)
+            else:
+                # Restored task keeps its own parameters and last known state
+                url = task.url
+                interval = task.interval
+                launch_time = task.launch_time
+            monitor = ProductMonitorWorker(**self.runtime.monitor_kwargs(task))
 
             monitor_id = monitor.task_id
             self.active_monitors[monitor_id] = monitor
-            monitor.start()
+            self.runtime.schedule(monitor.task, start_delay=start_delay, on_ready=on_ready)
 
             # Add new row to the table
+            product_name, product_status = monitor.restored_status()
             self.table_widget.add_or_update_row(
-                url, monitor_id, "Loading", "Active", "Searching", "Pending", interval
+                url, monitor_id, product_name, "Active", product_status, "Pending", interval,
+                launch_time=launch_time
             )
 
-            # self.log_display.append(f"Started monitoring: {url}")
             self.stop_button.setEnabled(True)
             return monitor_id
 
         except Exception as e:
             self.logger.error(f"Error starting monitor: {e}")
-            # self.log_display.append(f"Error starting monitoring: {str(e)}")
             return None
 
     def handle_stop_task(self, task_id):
         """Handle the stop task action when a stop button is clicked"""
         if task_id in self.active_monitors:
-            # Perform UI updates and disable the button (if required)
-            row = self.table_widget.task_row_map.get(task_id)
-            if row is not None:
-                self.table_widget.setItem(
-                    row, 1, self.table_widget.create_styled_item("Stopped", "monitoring"))
-                product_status_item = self.table_widget.item(
-                    row, 2)  # Get the product status column
-                product_status = product_status_item.text() if product_status_item else None
-                if product_status in ["Searching"]:
-                    self.table_widget.setItem(
-                        row, 2, self.table_widget.create_styled_item("Unknown", "product"))
-                self.table_widget.setItem(
-                    row, 3, self.table_widget.create_styled_item("Cancelled", "notification"))
-
-                # Disable the stop button for this task
-                stop_button = self.table_widget.cellWidget(row, 4)
-                if stop_button:
-                    stop_button.setEnabled(False)
+            # Perform UI updates; a Stopped row also disables its Stop button
+            if self.table_widget.has_task(task_id):
+                self.table_widget.update_monitoring_status(task_id, "Stopped")
+                if self.table_widget.task_field(task_id, 'product_status') in ["Searching"]:
+                    self.table_widget.update_product_status(task_id, "Unknown")
+                self.table_widget.update_notification_status(task_id, "Cancelled")
 
             task = self.active_monitors[task_id]
             # Call stop method of the corresponding task (assuming ProductMonitorWorker has a stop method)
             task.stop(task_id)
+            self.runtime.forget_task(task_id)
             # Remove the task from active monitors after stopping
             self.active_monitors.pop(task_id, None)
             self.logger.info(f"Task {task_id} stopped.")
@@ -892,21 +877,10 @@ class MainWindow(QMainWindow):
 
             # Update the UI for all tasks first
             for task_id in list(self.active_monitors.keys()):
-                row = self.table_widget.task_row_map.get(task_id)
-
-                if row is not None:
-                    # Update the status columns
-                    self.table_widget.setItem(
-                        row, 1, self.table_widget.create_styled_item("Stopped", "monitoring"))
-                    self.table_widget.setItem(
-                        row, 2, self.table_widget.create_styled_item("Unknown", "product"))
-                    self.table_widget.setItem(
-                        row, 3, self.table_widget.create_styled_item("Cancelled", "notification"))
-
-                    # Disable the stop button for the task
-                    stop_button = self.table_widget.cellWidget(row, 4)
-                    if stop_button:
-                        stop_button.setEnabled(False)
+                # Update the status columns; Stopped also disables the Stop button
+                self.table_widget.update_monitoring_status(task_id, "Stopped")
+                self.table_widget.update_product_status(task_id, "Unknown")
+                self.table_widget.update_notification_status(task_id, "Cancelled")
 
             # Stop all monitoring tasks
             for task_id, monitor in list(self.active_monitors.items()):
@@ -914,6 +888,9 @@ class MainWindow(QMainWindow):
                     # Stop the monitor
                     monitor.stop()
                     monitor.wait()
+                    # On shutdown the tasks stay checkpointed so they are restored next start
+                    if not self.shutting_down:
+                        self.runtime.forget_task(task_id)
 
                     # Remove from active monitors
                     self.active_monitors.pop(task_id, None)
@@ -983,12 +960,12 @@ class MainWindow(QMainWindow):
             reply = message_box.exec()
 
             if reply == QMessageBox.StandardButton.Yes:
-                Monitoring_status = self.table_widget.save_active_tasks(
-                    self.file_path)
-                print('Monitoring_status are', Monitoring_status)
+                self.shutting_down = True
+                self.persistence_manager.compact()
+                self.log_panel.detach_logging()
                 # Stop bot if running
                 if self.bot_thread and self.bot_thread.is_alive():
-                    # Add cleanup function in telegram_bot.py
+                    from src.core.notifications import telegram_bot
                     asyncio.run(telegram_bot.cleanup())
                     self.bot_thread.join(timeout=1)
                 self.stop_all_monitoring()